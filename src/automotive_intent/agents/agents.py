@@ -48,6 +48,10 @@ Understand Hindi/Hinglish:
             try:
                 from ..config import config
                 
+                if config.TEST_MODE == "offline":
+                    # Offline test mode: deterministic fallbacks, no network
+                    return
+                
                 if getattr(config, "USE_GROQ", False) and config.GROQ_API_KEY:
                     # Use Groq
                     from langchain_groq import ChatGroq
@@ -152,7 +156,7 @@ class KnowledgeAgent:
             self._ensure_service()
             
             # Import hierarchy for re-ranking
-            from ..services.knowledge_hierarchy import get_knowledge_hierarchy
+            from ..services.knowledge_hierarchy import get_knowledge_hierarchy, normalize_source_type
             hierarchy = get_knowledge_hierarchy()
             
             # Search with original complaint
@@ -161,6 +165,11 @@ class KnowledgeAgent:
                 n_results=5  # Get more, then filter
             )
             
+            # Normalize source types once at the retrieval boundary
+            for r in results:
+                if "source_type" in r.metadata:
+                    r.metadata["source_type"] = normalize_source_type(r.metadata["source_type"])
+            
             # Convert to hierarchy format for re-ranking
             docs_for_ranking = [
                 {
@@ -283,6 +292,10 @@ Use ONLY values from valid categories. For two-wheelers, prefer TWO_WHEELER syst
             try:
                 from ..config import config
                 
+                if config.TEST_MODE == "offline":
+                    # Offline test mode: deterministic fallbacks, no network
+                    return
+                
                 if getattr(config, "USE_GROQ", False) and config.GROQ_API_KEY:
                     # Use Groq
                     from langchain_groq import ChatGroq
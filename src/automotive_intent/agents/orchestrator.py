@@ -3,9 +3,13 @@ Multi-Agent Orchestration using LangGraph
 Coordinates agents in a workflow to diagnose automotive issues.
 """
 import logging
-from typing import Dict, Any, Literal
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Literal, Optional, Tuple
 from langgraph.graph import StateGraph, END
 
+from ..config import config
 from .state import AgentState, Message, ChatRequest, ChatResponse
 from .agents import (
     SymptomAnalystAgent,
@@ -29,7 +33,7 @@ class DiagnosticOrchestrator:
     5. Diagnosis Agent → makes final diagnosis
     """
     
-    def __init__(self):
+    def __init__(self, max_sessions: Optional[int] = None):
         # Initialize agents
         self.symptom_agent = SymptomAnalystAgent()
         self.knowledge_agent = KnowledgeAgent()
@@ -39,8 +43,9 @@ class DiagnosticOrchestrator:
         # Build graph
         self.graph = self._build_graph()
         
-        # Session storage
-        self._sessions: Dict[str, AgentState] = {}
+        # Session storage, bounded LRU (oldest-used first)
+        self._sessions: "OrderedDict[str, AgentState]" = OrderedDict()
+        self.max_sessions = max_sessions or config.MAX_AGENT_SESSIONS
     
     def _build_graph(self) -> StateGraph:
         """Build the LangGraph workflow."""
@@ -50,8 +55,8 @@ class DiagnosticOrchestrator:
         
         # Add nodes
         workflow.add_node("symptom_analyst", self._symptom_node)
+        workflow.add_node("context_retrieval", self._context_node)
         workflow.add_node("knowledge_retrieval", self._knowledge_node)
-        workflow.add_node("historian", self._historian_node)
         workflow.add_node("diagnosis", self._diagnosis_node)
         workflow.add_node("respond", self._respond_node)
         
@@ -62,8 +67,8 @@ class DiagnosticOrchestrator:
         workflow.set_entry_point("symptom_analyst")
         
         # Define edges with reflection loop
-        workflow.add_edge("symptom_analyst", "historian")
-        workflow.add_edge("historian", "knowledge_retrieval")
+        workflow.add_edge("symptom_analyst", "context_retrieval")
+        workflow.add_edge("context_retrieval", "diagnosis")
         workflow.add_edge("knowledge_retrieval", "diagnosis")
         
         # Conditional edge from diagnosis
@@ -105,6 +110,20 @@ class DiagnosticOrchestrator:
         result = self.historian_agent.process(agent_state)
         return result.model_dump()
     
+    def _context_node(self, state: dict) -> dict:
+        """
+        Run the historian and knowledge agents concurrently.
+        Both only read the symptom output; each works on its own copy of the state.
+        
+        The historian gets its own thread per call: the orchestrator is shared
+        by every session, so a shared worker would queue concurrent users.
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="historian") as pool:
+            tickets = pool.submit(self._historian_node, state)
+            result = self._knowledge_node(state)
+            result["similar_tickets"] = tickets.result()["similar_tickets"]
+        return result
+    
     def _diagnosis_node(self, state: dict) -> dict:
         """Make diagnosis."""
         logger.info("🔧 Diagnosis Agent analyzing...")
@@ -195,13 +214,10 @@ class DiagnosticOrchestrator:
     
     def _lookup_parts(self, failure_mode: str, component: str) -> dict | None:
         """Lookup parts dependencies from graph."""
-        import json
-        from pathlib import Path
+        from ..services.parts_graph import load_parts_graph
         
         try:
-            graph_path = Path(__file__).parent.parent.parent.parent / "data" / "parts_graph.json"
-            with open(graph_path) as f:
-                graph = json.load(f)
+            graph = load_parts_graph()
             
             # Try matching by failure_mode or component
             key = failure_mode.lower().replace("_", "_")
@@ -225,9 +241,8 @@ class DiagnosticOrchestrator:
         
         return None
     
-    def process_message(self, request: ChatRequest) -> ChatResponse:
-        """Process a user message through the agent workflow."""
-        
+    def _start_turn(self, request: ChatRequest) -> AgentState:
+        """Load or create the session state and add the user's message."""
         # Get or create session
         if request.session_id and request.session_id in self._sessions:
             state = self._sessions[request.session_id]
@@ -240,10 +255,8 @@ class DiagnosticOrchestrator:
         normalized_text, norm_meta = normalizer.normalize(request.message)
         
         # Extract VIN if present
-        from ..services.vin_decoder import get_vin_decoder
-        import re
-        vin_pattern = r'[A-HJ-NPR-Z0-9]{17}|[A-Z]{2}\d{1,2}[A-Z]{1,3}\d{1,4}'
-        vin_match = re.search(vin_pattern, request.message, re.IGNORECASE)
+        from ..services.vin_decoder import VIN_OR_REG_SEARCH_PATTERN, get_vin_decoder
+        vin_match = VIN_OR_REG_SEARCH_PATTERN.search(request.message)
         if vin_match:
             decoder = get_vin_decoder()
             vehicle_info = decoder.decode(vin_match.group())
@@ -267,22 +280,24 @@ class DiagnosticOrchestrator:
         else:
             state.detected_language = "en"
         
-        # Run workflow
-        try:
-            # Convert Pydantic model to dict for LangGraph
-            state_dict = state.model_dump()
-            final_state = self.graph.invoke(state_dict)
-            state = AgentState(**final_state)
-        except Exception as e:
-            logger.error(f"Workflow error: {e}")
-            state.messages.append(Message(
-                role="assistant",
-                content=f"Sorry, an error occurred: {str(e)}",
-                agent="system"
-            ))
-        
-        # Store session
+        return state
+    
+    def _workflow_error(self, state: AgentState, e: Exception) -> None:
+        """Log a workflow failure and answer with an apology."""
+        logger.error(f"Workflow error: {e}")
+        state.messages.append(Message(
+            role="assistant",
+            content=f"Sorry, an error occurred: {str(e)}",
+            agent="system"
+        ))
+    
+    def _finish_turn(self, state: AgentState) -> ChatResponse:
+        """Store the session and build the response."""
+        # Store session (most recently used last), evicting the least recently used
         self._sessions[state.session_id] = state
+        self._sessions.move_to_end(state.session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
         
         # Build response
         last_message = state.messages[-1] if state.messages else Message(role="assistant", content="")
@@ -298,23 +313,66 @@ class DiagnosticOrchestrator:
             needs_input=state.needs_clarification
         )
     
+    def process_message(self, request: ChatRequest) -> ChatResponse:
+        """Process a user message through the agent workflow."""
+        state = self._start_turn(request)
+        
+        # Run workflow
+        try:
+            # Convert Pydantic model to dict for LangGraph
+            state_dict = state.model_dump()
+            final_state = self.graph.invoke(state_dict)
+            state = AgentState(**final_state)
+        except Exception as e:
+            self._workflow_error(state, e)
+        
+        return self._finish_turn(state)
+    
+    def stream_message(self, request: ChatRequest) -> Iterator[Tuple[str, Optional[ChatResponse]]]:
+        """
+        Process a message, yielding progress as the workflow runs.
+        
+        Yields (node_name, None) as each agent node finishes, then
+        ("done", response) with the same response process_message returns.
+        """
+        state = self._start_turn(request)
+        
+        try:
+            final_state = None
+            for update in self.graph.stream(state.model_dump(), stream_mode="updates"):
+                for node, final_state in update.items():
+                    yield node, None
+            if final_state is not None:
+                state = AgentState(**final_state)
+        except Exception as e:
+            self._workflow_error(state, e)
+        
+        yield "done", self._finish_turn(state)
+    
     def get_session(self, session_id: str) -> AgentState | None:
         """Get session state."""
         return self._sessions.get(session_id)
     
     def clear_session(self, session_id: str):
         """Clear a session."""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        self._sessions.pop(session_id, None)
+    
+    def clear_sessions(self):
+        """Clear all sessions."""
+        self._sessions.clear()
 
 
 # Singleton
 _orchestrator: DiagnosticOrchestrator | None = None
+# The UI builds it from a prewarm thread while requests may already arrive
+_orchestrator_lock = threading.Lock()
 
 
 def get_orchestrator() -> DiagnosticOrchestrator:
     """Get or create orchestrator instance."""
     global _orchestrator
     if _orchestrator is None:
-        _orchestrator = DiagnosticOrchestrator()
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = DiagnosticOrchestrator()
     return _orchestrator
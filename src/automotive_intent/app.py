@@ -4,7 +4,7 @@ Enterprise-grade REST API with structured logging and rate limiting.
 """
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 import logging
 import json
@@ -12,6 +12,7 @@ import time
 import uuid
 from collections import defaultdict
 from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
 
 from .config import config
 from .core.schemas import ClassificationRequest, ServiceTicket
@@ -65,6 +66,7 @@ async def lifespan(app: FastAPI):
         use_nllb=config.USE_NLLB
     )
     
+    _response_cache.clear()  # drop any payload cached before the pipeline loaded
     logger.info("Pipeline initialized successfully!")
     
     # Warm up models for faster first request
@@ -145,13 +147,30 @@ async def rate_limit_middleware(request: Request, call_next):
     return response
 
 
+# Short-lived serialized GET payloads: key -> (monotonic timestamp, JSON body)
+_response_cache: Dict[str, Tuple[float, bytes]] = {}
+
+HEALTH_CACHE_TTL = 5.0
+FEEDBACK_STATS_CACHE_TTL = 30.0
+
+
+def _cached_json(key: str, ttl: float, build: Callable[[], dict]) -> Response:
+    """Serve a JSON body from the response cache, rebuilding it once per TTL window."""
+    now = time.monotonic()
+    entry = _response_cache.get(key)
+    if entry is None or now - entry[0] >= ttl:
+        entry = (now, json.dumps(build()).encode("utf-8"))
+        _response_cache[key] = entry
+    return Response(content=entry[1], media_type="application/json")
+
+
 @app.get("/health")
 async def health_check():
     """
     Health check endpoint.
     Returns service status and model availability.
     """
-    return {
+    return _cached_json("health", HEALTH_CACHE_TTL, lambda: {
         "status": "healthy",
         "pipeline_loaded": _pipeline is not None,
         "config": {
@@ -159,7 +178,7 @@ async def health_check():
             "nllb_enabled": config.USE_NLLB,
             "model": config.OLLAMA_MODEL
         }
-    }
+    })
 
 
 @app.get("/")
@@ -273,31 +292,43 @@ async def classify_complaint(request: ClassificationRequest) -> ServiceTicket:
         )
 
 
+# Serialized bodies for static endpoints, built on first request
+_ontology_body: Optional[bytes] = None
+_config_body: Optional[bytes] = None
+
+
 @app.get("/v1/ontology")
 async def get_ontology():
     """
     Return the service ontology for reference.
     Useful for UI dropdowns or validation on client side.
+    The ontology is immutable, so the JSON body is serialized once and reused.
     """
-    from .core.ontology import SERVICE_ONTOLOGY
-    return {
-        "ontology": SERVICE_ONTOLOGY,
-        "description": "Valid system -> component -> failure_mode paths"
-    }
+    global _ontology_body
+    if _ontology_body is None:
+        from .core.ontology import SERVICE_ONTOLOGY
+        _ontology_body = json.dumps({
+            "ontology": SERVICE_ONTOLOGY,
+            "description": "Valid system -> component -> failure_mode paths"
+        }).encode("utf-8")
+    return Response(content=_ontology_body, media_type="application/json")
 
 
 @app.get("/v1/config")
 async def get_config():
     """Return current configuration (non-sensitive)."""
-    return {
-        "environment": config.ENV,
-        "ollama_model": config.OLLAMA_MODEL,
-        "nllb_model": config.NLLB_MODEL if config.USE_NLLB else None,
-        "thresholds": {
-            "confidence": config.CONFIDENCE_THRESHOLD,
-            "ambiguity_delta": config.AMBIGUITY_DELTA
-        }
-    }
+    global _config_body
+    if _config_body is None:
+        _config_body = json.dumps({
+            "environment": config.ENV,
+            "ollama_model": config.OLLAMA_MODEL,
+            "nllb_model": config.NLLB_MODEL if config.USE_NLLB else None,
+            "thresholds": {
+                "confidence": config.CONFIDENCE_THRESHOLD,
+                "ambiguity_delta": config.AMBIGUITY_DELTA
+            }
+        }).encode("utf-8")
+    return Response(content=_config_body, media_type="application/json")
 
 
 @app.get("/v1/metrics")
@@ -424,6 +455,9 @@ async def submit_feedback(request: FeedbackRequest):
     if not success:
         raise HTTPException(status_code=500, detail="Failed to record feedback")
     
+    # New feedback invalidates the cached stats
+    _response_cache.pop("feedback_stats", None)
+    
     return {
         "status": "recorded",
         "ticket_id": request.ticket_id,
@@ -441,13 +475,16 @@ async def get_feedback_stats():
     - Accuracy by system
     - Top misdiagnoses (for targeted improvement)
     - Recent trend (7-day window)
+    
+    Cached for FEEDBACK_STATS_CACHE_TTL seconds; submitting feedback invalidates it.
     """
     from .services.feedback_loop import get_feedback_store
     
-    store = get_feedback_store()
-    stats = store.get_accuracy_stats()
-    
-    return stats.model_dump()
+    return _cached_json(
+        "feedback_stats",
+        FEEDBACK_STATS_CACHE_TTL,
+        lambda: get_feedback_store().get_accuracy_stats().model_dump(mode="json"),
+    )
 
 
 # ===== Multi-Agent Chat Endpoints =====
@@ -14,6 +14,9 @@ class Config:
     # Environment
     ENV: Literal["production", "development", "testing"] = "production"
     
+    # Test mode: "offline" answers LLM calls from canned fixtures (no network)
+    TEST_MODE: str = ""
+    
     # LLM Settings
     USE_OLLAMA: bool = False  # Disabled - using Groq instead
     OLLAMA_MODEL: str = "phi3:mini"
@@ -34,6 +37,9 @@ class Config:
     CONFIDENCE_THRESHOLD: float = 0.70
     AMBIGUITY_DELTA: float = 0.10
     
+    # Agent Settings
+    MAX_AGENT_SESSIONS: int = 1000  # least recently used sessions are evicted beyond this
+    
     # API Settings
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
@@ -48,11 +54,13 @@ class Config:
         """Create config from environment variables."""
         return cls(
             ENV=os.getenv("AMI_ENV", "production"),
+            TEST_MODE=os.getenv("GARAGEIQ_TEST_MODE", "").lower(),
             USE_OLLAMA=os.getenv("AMI_USE_OLLAMA", "true").lower() == "true",
             OLLAMA_MODEL=os.getenv("AMI_OLLAMA_MODEL", "mistral"),
             OLLAMA_BASE_URL=os.getenv("AMI_OLLAMA_URL", "http://localhost:11434"),
             USE_NLLB=os.getenv("AMI_USE_NLLB", "true").lower() == "true",
             NLLB_MODEL=os.getenv("AMI_NLLB_MODEL", "facebook/nllb-200-distilled-600M"),
+            MAX_AGENT_SESSIONS=int(os.getenv("AMI_MAX_AGENT_SESSIONS", "1000")),
             API_HOST=os.getenv("AMI_HOST", "0.0.0.0"),
             API_PORT=int(os.getenv("AMI_PORT", "8000")),
             GROQ_API_KEY=os.getenv("GROQ_API_KEY", ""),  # Required: set GROQ_API_KEY env var
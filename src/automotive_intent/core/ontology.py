@@ -1,4 +1,6 @@
-from typing import Dict, List, Set
+import sys
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Set, Tuple
 
 # --- Core Service Ontology (Closed World) ---
 # PRD Section 7 — Expanded with SUSPENSION, STEERING, EXHAUST
@@ -209,38 +211,59 @@ SERVICE_ONTOLOGY: Dict[str, Dict[str, List[str]]] = {
     }
 }
 
+# Intern every name so canonicalized Intent fields (see schemas.Intent) share
+# identity with these constants and equality/hash probes short-circuit on the pointer
+SERVICE_ONTOLOGY = {
+    sys.intern(system): {
+        sys.intern(component): [sys.intern(mode) for mode in modes]
+        for component, modes in components.items()
+    }
+    for system, components in SERVICE_ONTOLOGY.items()
+}
+
 # --- Helper Sets for Validation Speed ---
 
 VALID_SYSTEMS: Set[str] = set(SERVICE_ONTOLOGY.keys())
 
-def get_valid_components(system: str) -> Set[str]:
+# Every valid (system, component, failure_mode) path, for O(1) path checks
+_VALID_TRIPLES: FrozenSet[Tuple[str, str, str]] = frozenset(
+    (system, component, mode)
+    for system, components in SERVICE_ONTOLOGY.items()
+    for component, modes in components.items()
+    for mode in modes
+)
+
+# Per-system components and per-(system, component) failure modes, precomputed
+_COMPONENTS_BY_SYSTEM: Dict[str, FrozenSet[str]] = {
+    system: frozenset(components)
+    for system, components in SERVICE_ONTOLOGY.items()
+}
+_FAILURE_MODES_BY_COMPONENT: Dict[Tuple[str, str], FrozenSet[str]] = {
+    (system, component): frozenset(modes)
+    for system, components in SERVICE_ONTOLOGY.items()
+    for component, modes in components.items()
+}
+_EMPTY: FrozenSet[str] = frozenset()
+
+def get_valid_components(system: str) -> FrozenSet[str]:
     """Return valid components for a given system."""
-    if system not in SERVICE_ONTOLOGY:
-        return set()
-    return set(SERVICE_ONTOLOGY[system].keys())
+    return _COMPONENTS_BY_SYSTEM.get(system, _EMPTY)
 
-def get_valid_failure_modes(system: str, component: str) -> Set[str]:
+def get_valid_failure_modes(system: str, component: str) -> FrozenSet[str]:
     """Return valid failure modes for a given system and component."""
-    if system not in SERVICE_ONTOLOGY:
-        return set()
-    if component not in SERVICE_ONTOLOGY[system]:
-        return set()
-    return set(SERVICE_ONTOLOGY[system][component])
+    return _FAILURE_MODES_BY_COMPONENT.get((system, component), _EMPTY)
 
 def validate_ontology_path(system: str, component: str, failure_mode: str) -> bool:
     """
     Strict boolean check if a path exists in the ontology.
     Used by Pydantic validators.
     """
-    if system not in SERVICE_ONTOLOGY:
-        return False
-    if component not in SERVICE_ONTOLOGY[system]:
-        return False
-    return failure_mode in SERVICE_ONTOLOGY[system][component]
+    return (system, component, failure_mode) in _VALID_TRIPLES
 
 
+@lru_cache(maxsize=None)
 def get_ontology_formatted() -> str:
-    """Return ontology as formatted string for LLM prompts."""
+    """Return ontology as formatted string for LLM prompts (built once; the ontology is immutable)."""
     lines = []
     for system, components in SERVICE_ONTOLOGY.items():
         lines.append(f"SYSTEM: {system}")
@@ -1,7 +1,9 @@
+import sys
 from typing import List, Optional, Literal
 from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import datetime, timezone
 from .ontology import validate_ontology_path, VALID_SYSTEMS, get_valid_components, get_valid_failure_modes
+from ..services.vmrs_codes import get_vmrs_mapper
 
 # --- Enums (defined as Literals/Constants for Pydantic) ---
 
@@ -33,28 +35,28 @@ class Intent(BaseModel):
         Critical: Enforces that the intent tuple exists in the hardcoded ontology.
         If the LLM hallucinates a new Failure Mode, this validation fails.
         """
-        # Upper case everything to be safe/canonical
-        sys = self.system.upper()
-        comp = self.component.upper()
-        mode = self.failure_mode.upper()
+        # Upper case everything to be safe/canonical (read fields once)
+        values = self.__dict__
+        system = values["system"].upper()
+        comp = values["component"].upper()
+        mode = values["failure_mode"].upper()
 
-        if not validate_ontology_path(sys, comp, mode):
+        if not validate_ontology_path(system, comp, mode):
              # You might raise values error or handle it. 
              # For a strict schema, we raise ValueError which Pydantic catches.
              # In the pipeline, we must handle this gracefully (e.g. mark as Validation Failed).
-             raise ValueError(f"Invalid Ontology Path: {sys} -> {comp} -> {mode} is not allowed.")
+             raise ValueError(f"Invalid Ontology Path: {system} -> {comp} -> {mode} is not allowed.")
         
-        # Normalize casing in the model
-        self.system = sys
-        self.component = comp
-        self.failure_mode = mode
+        # Normalize casing in the model (fields are already set, skip __setattr__);
+        # interning makes the stored values the ontology's own string objects
+        values["system"] = system = sys.intern(system)
+        values["component"] = comp = sys.intern(comp)
+        values["failure_mode"] = mode = sys.intern(mode)
         
         # Auto-populate VMRS code if not already set
         if self.vmrs_code is None:
             try:
-                from ..services.vmrs_codes import get_vmrs_mapper
-                mapper = get_vmrs_mapper()
-                vmrs = mapper.get_vmrs_code(sys, comp, mode)
+                vmrs = get_vmrs_mapper().get_vmrs_code(system, comp, mode)
                 if vmrs:
                     self.vmrs_code = vmrs.code
             except Exception:
@@ -2,10 +2,12 @@
 Intent Classification Pipeline
 Orchestrates translation, classification, and triage with follow-up questions.
 """
-from typing import Optional, List
+from typing import ClassVar, Optional, List, Dict, Tuple
 import logging
+import threading
 from datetime import datetime, timezone
 
+from .core.ontology import SERVICE_ONTOLOGY
 from .core.schemas import (
     ServiceTicket,
     ClassificationRequest,
@@ -33,64 +35,71 @@ class TriageEngine:
     # High severity systems/modes
     HIGH_SEVERITY_SYSTEMS = {"BRAKES"}
     HIGH_SEVERITY_MODES = {"OVERHEATING", "FLUID_LEAK", "SPONGY_PEDAL", "WARNING_LIGHT"}
-    
-    # Medium severity systems
-    MEDIUM_SYSTEMS = {"HVAC", "EXHAUST"}
+
+    # Diagnostic actions keyed by (system, component)
+    ACTIONS: ClassVar[Dict[Tuple[str, str], str]] = {
+        ("ELECTRICAL", "STARTER_MOTOR"): "Check battery voltage → inspect starter relay → test starter motor",
+        ("ELECTRICAL", "BATTERY"): "Test battery voltage → inspect terminals → check charging system",
+        ("ELECTRICAL", "ALTERNATOR"): "Test alternator output → check belt tension → inspect connections",
+        ("POWERTRAIN", "ENGINE"): "Check fuel system → inspect ignition → test compression",
+        ("POWERTRAIN", "TRANSMISSION"): "Check transmission fluid → inspect linkage → scan DTCs",
+        ("HVAC", "COMPRESSOR"): "Check refrigerant level → inspect compressor clutch → verify pressures",
+        ("HVAC", "BLOWER_MOTOR"): "Check fuse → test blower resistor → inspect motor",
+        ("HVAC", "HEATER_CORE"): "Check coolant level → inspect heater hoses → test thermostat",
+        ("BRAKES", "PADS_ROTORS"): "Inspect pad thickness → check rotor condition → verify caliper operation",
+        ("BRAKES", "BRAKE_FLUID"): "Check fluid level → inspect for leaks → bleed system",
+        ("BRAKES", "ABS"): "Scan ABS codes → check wheel sensors → inspect module",
+        ("SUSPENSION", "SHOCKS_STRUTS"): "Visual inspection → bounce test → check for leaks",
+        ("SUSPENSION", "BALL_JOINTS"): "Check for play → inspect boots → test under load",
+        ("SUSPENSION", "CONTROL_ARMS"): "Inspect bushings → check for play → verify alignment",
+        ("STEERING", "POWER_STEERING"): "Check fluid level → inspect pump → look for leaks",
+        ("STEERING", "STEERING_RACK"): "Check for play → inspect boots → verify tie rod ends",
+        ("STEERING", "TIE_RODS"): "Check for play → inspect boots → verify alignment",
+        ("EXHAUST", "CATALYTIC_CONVERTER"): "Scan DTCs → check O2 sensors → inspect for damage",
+        ("EXHAUST", "MUFFLER"): "Visual inspection → check hangers → look for rust/holes",
+        ("EXHAUST", "EXHAUST_MANIFOLD"): "Visual inspection → check for cracks → verify gaskets",
+        ("TIRES_WHEELS", "TIRES"): "Inspect tire → check pressure → locate damage → repair or replace",
+        ("TIRES_WHEELS", "WHEELS"): "Inspect rim → check for bends/cracks → verify lug torque",
+        ("TIRES_WHEELS", "TPMS"): "Scan TPMS sensors → check battery → verify calibration",
+    }
+    DEFAULT_ACTION = "Perform visual inspection and diagnostic scan"
+
+    # (system, component, failure_mode) -> (severity, vehicle_state), built at import
+    _TRIAGE_TABLE: ClassVar[Dict[Tuple[str, str, str], Tuple[str, str]]] = {}
+
+    @classmethod
+    def _apply_rules(cls, system: str, failure_mode: str) -> Tuple[str, str]:
+        """Evaluate the triage rules for a single path."""
+        if failure_mode in cls.CRITICAL_MODES:
+            return "CRITICAL", "IMMOBILIZED"
+        if system in cls.HIGH_SEVERITY_SYSTEMS:
+            return "HIGH", "DRIVABLE_WITH_CAUTION"
+        if failure_mode in cls.HIGH_SEVERITY_MODES:
+            return "HIGH", "DRIVABLE_WITH_CAUTION"
+        return "MEDIUM", "NORMAL"
+
+    @classmethod
+    def _lookup(cls, intent: Intent) -> Tuple[str, str]:
+        """Table lookup, falling back to the rules for off-ontology intents."""
+        result = cls._TRIAGE_TABLE.get((intent.system, intent.component, intent.failure_mode))
+        if result is None:
+            result = cls._apply_rules(intent.system, intent.failure_mode)
+        return result
 
     @classmethod
     def determine_severity(cls, intent: Intent) -> str:
         """Determine severity based on intent."""
-        if intent.failure_mode in cls.CRITICAL_MODES:
-            return "CRITICAL"
-        if intent.system in cls.HIGH_SEVERITY_SYSTEMS:
-            return "HIGH"
-        if intent.failure_mode in cls.HIGH_SEVERITY_MODES:
-            return "HIGH"
-        if intent.system in cls.MEDIUM_SYSTEMS:
-            return "MEDIUM"
-        if intent.system == "SUSPENSION":
-            return "MEDIUM"
-        return "MEDIUM"
+        return cls._lookup(intent)[0]
 
     @classmethod
     def determine_vehicle_state(cls, intent: Intent) -> str:
         """Determine vehicle state based on intent."""
-        if intent.failure_mode in cls.CRITICAL_MODES:
-            return "IMMOBILIZED"
-        if intent.system == "BRAKES" or intent.failure_mode in cls.HIGH_SEVERITY_MODES:
-            return "DRIVABLE_WITH_CAUTION"
-        return "NORMAL"
+        return cls._lookup(intent)[1]
 
     @classmethod
     def generate_action(cls, intent: Intent) -> str:
         """Generate suggested diagnostic action."""
-        actions = {
-            ("ELECTRICAL", "STARTER_MOTOR"): "Check battery voltage → inspect starter relay → test starter motor",
-            ("ELECTRICAL", "BATTERY"): "Test battery voltage → inspect terminals → check charging system",
-            ("ELECTRICAL", "ALTERNATOR"): "Test alternator output → check belt tension → inspect connections",
-            ("POWERTRAIN", "ENGINE"): "Check fuel system → inspect ignition → test compression",
-            ("POWERTRAIN", "TRANSMISSION"): "Check transmission fluid → inspect linkage → scan DTCs",
-            ("HVAC", "COMPRESSOR"): "Check refrigerant level → inspect compressor clutch → verify pressures",
-            ("HVAC", "BLOWER_MOTOR"): "Check fuse → test blower resistor → inspect motor",
-            ("HVAC", "HEATER_CORE"): "Check coolant level → inspect heater hoses → test thermostat",
-            ("BRAKES", "PADS_ROTORS"): "Inspect pad thickness → check rotor condition → verify caliper operation",
-            ("BRAKES", "BRAKE_FLUID"): "Check fluid level → inspect for leaks → bleed system",
-            ("BRAKES", "ABS"): "Scan ABS codes → check wheel sensors → inspect module",
-            ("SUSPENSION", "SHOCKS_STRUTS"): "Visual inspection → bounce test → check for leaks",
-            ("SUSPENSION", "BALL_JOINTS"): "Check for play → inspect boots → test under load",
-            ("SUSPENSION", "CONTROL_ARMS"): "Inspect bushings → check for play → verify alignment",
-            ("STEERING", "POWER_STEERING"): "Check fluid level → inspect pump → look for leaks",
-            ("STEERING", "STEERING_RACK"): "Check for play → inspect boots → verify tie rod ends",
-            ("STEERING", "TIE_RODS"): "Check for play → inspect boots → verify alignment",
-            ("EXHAUST", "CATALYTIC_CONVERTER"): "Scan DTCs → check O2 sensors → inspect for damage",
-            ("EXHAUST", "MUFFLER"): "Visual inspection → check hangers → look for rust/holes",
-            ("EXHAUST", "EXHAUST_MANIFOLD"): "Visual inspection → check for cracks → verify gaskets",
-            ("TIRES_WHEELS", "TIRES"): "Inspect tire → check pressure → locate damage → repair or replace",
-            ("TIRES_WHEELS", "WHEELS"): "Inspect rim → check for bends/cracks → verify lug torque",
-            ("TIRES_WHEELS", "TPMS"): "Scan TPMS sensors → check battery → verify calibration",
-        }
-        key = (intent.system, intent.component)
-        return actions.get(key, "Perform visual inspection and diagnostic scan")
+        return cls.ACTIONS.get((intent.system, intent.component), cls.DEFAULT_ACTION)
 
     @classmethod
     def create_triage(cls, intent: Intent) -> Triage:
@@ -102,6 +111,13 @@ class TriageEngine:
         )
 
 
+TriageEngine._TRIAGE_TABLE.update(
+    ((system, component, mode), TriageEngine._apply_rules(system, mode))
+    for system, components in SERVICE_ONTOLOGY.items()
+    for component, modes in components.items()
+    for mode in modes
+)
+
 class IntentPipeline:
     """
     Main orchestration pipeline.
@@ -263,6 +279,20 @@ class IntentPipeline:
         return summaries.get(intent.failure_mode, f"{intent.system} {intent.component} issue reported")
 
 
+# Cache of pipelines keyed by (use_ollama, use_nllb)
+_pipelines: Dict[Tuple[bool, bool], IntentPipeline] = {}
+# The UI's sample prewarm thread may build one while a request does too
+_pipelines_lock = threading.Lock()
+
+
 def create_pipeline(use_ollama: bool = True, use_nllb: bool = True) -> IntentPipeline:
-    """Create a new pipeline instance."""
-    return IntentPipeline(use_ollama=use_ollama, use_nllb=use_nllb)
+    """
+    Get or create a pipeline instance for the given backend flags.
+    Pipelines are stateless, so repeated calls share one instance per configuration.
+    """
+    key = (use_ollama, use_nllb)
+    if key not in _pipelines:
+        with _pipelines_lock:
+            if key not in _pipelines:
+                _pipelines[key] = IntentPipeline(use_ollama=use_ollama, use_nllb=use_nllb)
+    return _pipelines[key]
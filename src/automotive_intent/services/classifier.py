@@ -9,6 +9,7 @@ import json
 import logging
 import hashlib
 from functools import lru_cache
+from pathlib import Path
 
 from ..core.ontology import SERVICE_ONTOLOGY, validate_ontology_path, get_ontology_formatted
 from ..core.schemas import Intent
@@ -70,6 +71,9 @@ Input: "What is the weather?" → {{"candidates": [], "out_of_scope": true}}
 Now classify:
 """
 
+# Canned LLM responses used when GARAGEIQ_TEST_MODE=offline
+LLM_FIXTURES_PATH = Path(__file__).parent.parent.parent.parent / "data" / "llm_fixtures.json"
+
 # Follow-up question templates by system
 FOLLOW_UP_TEMPLATES = {
     "POWERTRAIN": [
@@ -139,16 +143,34 @@ class ClassifierService:
         self.use_ollama = use_ollama
         self._client = None
         self._cache: dict = {}
+        self._fixtures: Optional[dict] = None
         
         # Check config for Groq
         from ..config import config
         self.use_groq = getattr(config, "USE_GROQ", False)
         
-        if self.use_groq:
+        if config.TEST_MODE == "offline":
+            self._init_offline()
+        elif self.use_groq:
             self._init_groq()
         elif use_ollama:
             self._init_ollama()
 
+    def _init_offline(self) -> None:
+        """Load canned LLM responses instead of creating a network client."""
+        self.use_groq = False
+        self.use_ollama = False
+        try:
+            entries = json.loads(LLM_FIXTURES_PATH.read_text())
+            self._fixtures = {
+                self._get_cache_key(e["text"]): json.dumps(e["response"])
+                for e in entries
+            }
+            logger.info(f"Offline test mode: loaded {len(self._fixtures)} LLM fixtures")
+        except Exception as e:
+            logger.warning(f"Could not load LLM fixtures, using mock classifier: {e}")
+            self._fixtures = {}
+
     def _init_ollama(self) -> None:
         """Initialize Ollama client."""
         try:
@@ -287,6 +309,16 @@ class ClassifierService:
             logger.info(f"Cache hit for: {text[:50]}...")
             return self._cache[cache_key]
         
+        # Offline test mode: canned response, keyword mock for unknown inputs
+        if self._fixtures is not None:
+            raw_response = self._fixtures.get(cache_key)
+            if raw_response is None:
+                result = self._mock_classify(text)
+            else:
+                result = self._result_from_response(raw_response)
+            self._cache[cache_key] = result
+            return result
+        
         if (not self.use_ollama and not getattr(self, "use_groq", False)) or self._client is None:
             result = self._mock_classify(text)
             self._cache[cache_key] = result
@@ -300,51 +332,7 @@ class ClassifierService:
             messages = [HumanMessage(content=full_prompt)]
             
             response = self._client.invoke(messages)
-            raw_response = response.content
-            
-            candidates, out_of_scope = self._parse_llm_response(raw_response)
-            
-            if out_of_scope:
-                result = ClassificationResult(
-                    primary_intent=None,
-                    alternate_intents=[],
-                    is_ambiguous=False,
-                    is_out_of_scope=True,
-                    follow_up_questions=[],
-                    raw_llm_response=raw_response,
-                    error=None
-                )
-                self._cache[cache_key] = result
-                return result
-            
-            valid_intents = self._validate_and_create_intents(candidates)
-            
-            if not valid_intents:
-                result = ClassificationResult(
-                    primary_intent=None,
-                    alternate_intents=[],
-                    is_ambiguous=True,
-                    is_out_of_scope=False,
-                    follow_up_questions=FOLLOW_UP_TEMPLATES["GENERAL"][:3],
-                    raw_llm_response=raw_response,
-                    error="No valid intents after ontology validation"
-                )
-                self._cache[cache_key] = result
-                return result
-            
-            valid_intents.sort(key=lambda x: x.confidence, reverse=True)
-            is_ambiguous = self._check_ambiguity(valid_intents)
-            follow_ups = self._generate_follow_up_questions(valid_intents, is_ambiguous)
-            
-            result = ClassificationResult(
-                primary_intent=valid_intents[0],
-                alternate_intents=valid_intents[1:2],
-                is_ambiguous=is_ambiguous,
-                is_out_of_scope=False,
-                follow_up_questions=follow_ups,
-                raw_llm_response=raw_response,
-                error=None
-            )
+            result = self._result_from_response(response.content)
             self._cache[cache_key] = result
             return result
             
@@ -360,6 +348,48 @@ class ClassifierService:
                 error=str(e)
             )
 
+    def _result_from_response(self, raw_response: str) -> ClassificationResult:
+        """Turn a raw LLM JSON response into a validated ClassificationResult."""
+        candidates, out_of_scope = self._parse_llm_response(raw_response)
+        
+        if out_of_scope:
+            return ClassificationResult(
+                primary_intent=None,
+                alternate_intents=[],
+                is_ambiguous=False,
+                is_out_of_scope=True,
+                follow_up_questions=[],
+                raw_llm_response=raw_response,
+                error=None
+            )
+        
+        valid_intents = self._validate_and_create_intents(candidates)
+        
+        if not valid_intents:
+            return ClassificationResult(
+                primary_intent=None,
+                alternate_intents=[],
+                is_ambiguous=True,
+                is_out_of_scope=False,
+                follow_up_questions=FOLLOW_UP_TEMPLATES["GENERAL"][:3],
+                raw_llm_response=raw_response,
+                error="No valid intents after ontology validation"
+            )
+        
+        valid_intents.sort(key=lambda x: x.confidence, reverse=True)
+        is_ambiguous = self._check_ambiguity(valid_intents)
+        follow_ups = self._generate_follow_up_questions(valid_intents, is_ambiguous)
+        
+        return ClassificationResult(
+            primary_intent=valid_intents[0],
+            alternate_intents=valid_intents[1:2],
+            is_ambiguous=is_ambiguous,
+            is_out_of_scope=False,
+            follow_up_questions=follow_ups,
+            raw_llm_response=raw_response,
+            error=None
+        )
+
     def _mock_classify(self, text: str) -> ClassificationResult:
         """Mock classification for testing without Ollama."""
         logger.warning("MOCK CLASSIFIER USED - Ollama not available or disabled")
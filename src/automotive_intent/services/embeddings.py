@@ -4,12 +4,30 @@ Uses sentence-transformers for embeddings and ChromaDB for vector storage.
 """
 import json
 import logging
+import re
+import threading
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Bulletin headers such as "**Source Type:** TSB (Technical Service Bulletin)"
+_SOURCE_TYPE_HEADER = re.compile(r"^\*\*Source Type:\*\*\s*(\w+)", re.MULTILINE)
+_EFFECTIVE_DATE_HEADER = re.compile(r"^\*\*Effective Date:\*\*\s*(\d{4}-\d{2}-\d{2})", re.MULTILINE)
+
+
+def _document_header(content: str) -> Dict[str, str]:
+    """Source type and effective date declared in a knowledge document's header, if any."""
+    header = {}
+    match = _SOURCE_TYPE_HEADER.search(content)
+    if match:
+        header["source_type"] = match.group(1)
+    match = _EFFECTIVE_DATE_HEADER.search(content)
+    if match:
+        header["effective_date"] = match.group(1)
+    return header
+
 
 @dataclass
 class SearchResult:
@@ -124,6 +142,7 @@ class EmbeddingService:
     def _chunk_document(self, content: str, source: str) -> List[tuple]:
         """Split document into chunks with metadata."""
         chunks = []
+        header = _document_header(content)
         
         # Split by headers
         sections = content.split("\n## ")
@@ -140,7 +159,7 @@ class EmbeddingService:
             if len(text) > 50:  # Only include meaningful chunks
                 chunks.append((
                     text,
-                    {"source": source, "title": title, "type": "knowledge"}
+                    {"source": source, "title": title, "type": "knowledge", **header}
                 ))
         
         return chunks
@@ -242,11 +261,15 @@ class EmbeddingService:
 
 # Singleton
 _embedding_service: Optional[EmbeddingService] = None
+# The historian and knowledge agents may ask for it concurrently
+_embedding_service_lock = threading.Lock()
 
 
 def get_embedding_service() -> EmbeddingService:
     """Get or create embedding service instance."""
     global _embedding_service
     if _embedding_service is None:
-        _embedding_service = EmbeddingService()
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService()
     return _embedding_service
@@ -2,16 +2,44 @@
 Closed-Loop Learning Service
 Captures technician feedback to enable continuous improvement.
 """
+import atexit
+import io
 import json
 import logging
+import weakref
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict
-from pydantic import BaseModel, Field
-from collections import defaultdict
+from bisect import bisect_right, insort
+from typing import BinaryIO, ContextManager, Deque, Iterator, List, Optional, Dict, Tuple
+from pydantic import BaseModel, Field, ValidationError
+from collections import defaultdict, deque
 
 logger = logging.getLogger(__name__)
 
+# Optional: orjson parses JSON lines several times faster than the stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# JSON Lines store; earlier releases kept a JSON array next to it
+DEFAULT_STORAGE_PATH = Path(__file__).parent.parent.parent.parent / "data" / "feedback.jsonl"
+LEGACY_STORAGE_PATH = DEFAULT_STORAGE_PATH.with_suffix(".json")
+
+
+def _flush_at_exit(store_ref: "weakref.ref[FeedbackStore]") -> None:
+    """Write out a buffered store's pending entries at interpreter exit."""
+    store = store_ref()
+    if store is None:
+        return
+    try:
+        store.flush()
+    except OSError as e:
+        logger.error(f"Failed to flush {len(store._pending)} buffered feedback entries at exit: {e}")
+
 
 class FeedbackEntry(BaseModel):
     """Individual feedback entry from technician."""
@@ -53,103 +81,248 @@ class AccuracyStats(BaseModel):
     recent_accuracy: float = 0.0
 
 
+class _RunningStats:
+    """Incrementally maintained aggregates behind AccuracyStats."""
+    
+    RECENT_WINDOW = 7 * 24 * 3600
+    
+    def __init__(self):
+        self.total = 0
+        self.correct = 0
+        self.by_system = defaultdict(lambda: {"correct": 0, "incorrect": 0})
+        self.misdiagnoses: List[Dict[str, str]] = []
+        # (timestamp, was_correct) kept sorted so expired entries trim from the front
+        self._recent: List[Tuple[float, bool]] = []
+        self._recent_correct = 0
+    
+    def add(self, e: dict) -> None:
+        self.total += 1
+        was_correct = bool(e.get("was_correct"))
+        system = e.get("predicted_system", "UNKNOWN")
+        
+        # By system breakdown
+        if was_correct:
+            self.correct += 1
+            self.by_system[system]["correct"] += 1
+        else:
+            self.by_system[system]["incorrect"] += 1
+            # Top misdiagnoses
+            if e.get("actual_failure_mode") and len(self.misdiagnoses) < 5:
+                self.misdiagnoses.append({
+                    "predicted": f"{e.get('predicted_system')}/{e.get('predicted_failure_mode')}",
+                    "actual": f"{e.get('actual_system', 'UNK')}/{e.get('actual_failure_mode')}",
+                })
+        
+        try:
+            ts = datetime.fromisoformat(e.get("timestamp", "2000-01-01")).timestamp()
+        except (TypeError, ValueError):
+            return
+        insort(self._recent, (ts, was_correct))
+        self._recent_correct += was_correct
+    
+    def snapshot(self) -> AccuracyStats:
+        if not self.total:
+            return AccuracyStats(
+                total_feedback=0,
+                correct_count=0,
+                incorrect_count=0,
+                accuracy_rate=0.0
+            )
+        
+        # Recent accuracy (last 7 days); the cutoff only moves forward
+        cutoff = datetime.now().timestamp() - self.RECENT_WINDOW
+        expired = bisect_right(self._recent, (cutoff, True))
+        if expired:
+            self._recent_correct -= sum(c for _, c in self._recent[:expired])
+            del self._recent[:expired]
+        recent_total = len(self._recent)
+        
+        return AccuracyStats(
+            total_feedback=self.total,
+            correct_count=self.correct,
+            incorrect_count=self.total - self.correct,
+            accuracy_rate=self.correct / self.total,
+            by_system={k: dict(v) for k, v in self.by_system.items()},
+            top_misdiagnoses=list(self.misdiagnoses),
+            recent_accuracy=self._recent_correct / recent_total if recent_total else 0.0
+        )
+
+
 class FeedbackStore:
     """
-    JSON-backed feedback storage with analytics.
+    JSON Lines feedback storage with analytics.
     
-    In production, this would be a database. For demo, JSON is sufficient.
+    Entries are appended one per line, so recording feedback costs the same
+    regardless of history size. Accuracy aggregates are built by one streaming
+    scan and then updated on each append. In production, this would be a database.
     """
     
-    def __init__(self, storage_path: Path = None):
-        self.storage_path = storage_path or Path(__file__).parent.parent.parent.parent / "data" / "feedback.json"
-        self._ensure_file()
+    def __init__(self, storage_path: Path | BinaryIO | None = None, buffer_size: int = 1):
+        """
+        Args:
+            storage_path: JSONL file, or a binary file-like object (e.g.
+                io.BytesIO) to keep the store in memory. Defaults to
+                data/feedback.jsonl (migrated from data/feedback.json if only
+                the legacy file exists).
+            buffer_size: Entries held in memory before they are written out
+                with a single writelines(). Pending entries are also flushed
+                on reads and at interpreter exit.
+        """
+        if hasattr(storage_path, "write"):
+            self.storage_path = None
+            self._stream: Optional[BinaryIO] = storage_path
+        else:
+            self.storage_path = storage_path or DEFAULT_STORAGE_PATH
+            self._stream = None
+        self.buffer_size = max(1, buffer_size)
+        self._pending: Deque[FeedbackEntry] = deque()
+        self._stats: Optional[_RunningStats] = None
+        self._synced_size = -1
+        if self._stream is None:
+            self._ensure_file()
+        if self.buffer_size > 1:
+            atexit.register(_flush_at_exit, weakref.ref(self))
     
     def _ensure_file(self):
-        """Create storage file if it doesn't exist."""
+        """Create storage file if it doesn't exist; convert a legacy JSON array file."""
         if not self.storage_path.exists():
             self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-            self.storage_path.write_text("[]")
+            if self.storage_path == DEFAULT_STORAGE_PATH and LEGACY_STORAGE_PATH.exists():
+                # Keep history from before the switch to JSON Lines
+                self._convert_legacy(LEGACY_STORAGE_PATH)
+            else:
+                self.storage_path.touch()
+            return
+        
+        with self.storage_path.open(encoding="utf-8") as f:
+            is_legacy_array = f.read(64).lstrip().startswith("[")
+        if is_legacy_array:
+            self._convert_legacy(self.storage_path)
     
-    def _load(self) -> List[dict]:
-        """Load all feedback entries."""
+    def _convert_legacy(self, source: Path):
+        """Rewrite a legacy JSON array file as JSON Lines at storage_path."""
         try:
-            return json.loads(self.storage_path.read_text())
-        except:
-            return []
+            items = _json_loads(source.read_bytes())
+        except ValueError:
+            items = []
+        lines = []
+        rejected = 0
+        for item in items:
+            try:
+                lines.append(FeedbackEntry.model_validate(item).model_dump_json() + "\n")
+            except ValidationError:
+                rejected += 1
+        self.storage_path.write_text("".join(lines), encoding="utf-8")
+        logger.info(f"Converted {len(lines)} legacy feedback entries from {source.name} to JSON Lines")
+        if rejected:
+            logger.warning(f"Skipped {rejected} invalid legacy feedback entries in {source.name}")
+    
+    def _open(self, mode: str) -> ContextManager[BinaryIO]:
+        """Open the backing storage for binary reading ("rb") or appending ("ab")."""
+        if self._stream is None:
+            return self.storage_path.open(mode)
+        self._stream.seek(0, io.SEEK_END if mode == "ab" else io.SEEK_SET)
+        return nullcontext(self._stream)
     
-    def _save(self, entries: List[dict]):
-        """Save all feedback entries."""
-        self.storage_path.write_text(json.dumps(entries, indent=2))
+    def _size(self) -> int:
+        """Current size of the backing storage in bytes."""
+        if self._stream is not None:
+            return self._stream.seek(0, io.SEEK_END)
+        try:
+            return self.storage_path.stat().st_size
+        except OSError:
+            return 0
+    
+    def _iter_entries(self) -> Iterator[dict]:
+        """Stream feedback entries, skipping blank or corrupt lines."""
+        try:
+            self.flush()
+            with self._open("rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield _json_loads(line)
+                    except ValueError:
+                        logger.warning("Skipping corrupt feedback line")
+        except OSError:
+            return
+    
+    def _load(self) -> List[dict]:
+        """Load all feedback entries."""
+        return list(self._iter_entries())
     
     def record_feedback(self, entry: FeedbackEntry) -> bool:
         """
-        Record a new feedback entry.
+        Record a new feedback entry (single-line append, or buffered).
         
         Returns:
-            True if successful
+            True if the entry was written or accepted into the buffer. False
+            if a write-through store (buffer_size=1) failed to write it; the
+            entry is then dropped, so the caller can retry without duplicates.
+            A failed buffered flush keeps the whole batch for the next flush.
         """
+        self._pending.append(entry)
         try:
-            entries = self._load()
-            entries.append(entry.model_dump())
-            self._save(entries)
+            if len(self._pending) >= self.buffer_size:
+                self.flush()
             
             logger.info(f"Recorded feedback for {entry.ticket_id}: {'correct' if entry.was_correct else 'incorrect'}")
             return True
         except Exception as e:
-            logger.error(f"Failed to record feedback: {e}")
-            return False
+            if self.buffer_size == 1:
+                self._pending.pop()
+                logger.error(f"Failed to record feedback: {e}")
+                return False
+            logger.error(f"Failed to flush feedback, {len(self._pending)} entries stay buffered: {e}")
+            return True
     
-    def get_accuracy_stats(self) -> AccuracyStats:
-        """Calculate accuracy statistics."""
-        entries = self._load()
-        
-        if not entries:
-            return AccuracyStats(
-                total_feedback=0,
-                correct_count=0,
-                incorrect_count=0,
-                accuracy_rate=0.0
-            )
-        
-        correct = sum(1 for e in entries if e.get("was_correct"))
-        incorrect = len(entries) - correct
-        
-        # By system breakdown
-        by_system = defaultdict(lambda: {"correct": 0, "incorrect": 0})
-        for e in entries:
-            system = e.get("predicted_system", "UNKNOWN")
-            if e.get("was_correct"):
-                by_system[system]["correct"] += 1
-            else:
-                by_system[system]["incorrect"] += 1
-        
-        # Top misdiagnoses
-        misdiagnoses = []
-        for e in entries:
-            if not e.get("was_correct") and e.get("actual_failure_mode"):
-                misdiagnoses.append({
-                    "predicted": f"{e.get('predicted_system')}/{e.get('predicted_failure_mode')}",
-                    "actual": f"{e.get('actual_system', 'UNK')}/{e.get('actual_failure_mode')}",
-                })
+    def flush(self) -> None:
+        """
+        Write buffered entries to storage in one writelines() call.
         
-        # Recent accuracy (last 7 days)
-        recent_cutoff = (datetime.now().timestamp() - 7 * 24 * 3600)
-        recent_entries = [
-            e for e in entries 
-            if datetime.fromisoformat(e.get("timestamp", "2000-01-01")).timestamp() > recent_cutoff
-        ]
-        recent_correct = sum(1 for e in recent_entries if e.get("was_correct"))
-        recent_accuracy = recent_correct / len(recent_entries) if recent_entries else 0.0
+        All or nothing: on failure any partly written lines are truncated
+        away and the whole batch stays buffered, so a retry can't duplicate it.
+        """
+        if not self._pending:
+            return
+        entries = list(self._pending)
+        lines = [(e.model_dump_json() + "\n").encode("utf-8") for e in entries]
+        with self._open("ab") as f:
+            start = f.tell()
+            try:
+                f.writelines(lines)
+                f.flush()
+            except OSError:
+                try:
+                    f.truncate(start)
+                except OSError as e:
+                    logger.warning(f"Could not roll back a partial feedback write: {e}")
+                raise
+            end = f.tell()
+        self._pending.clear()
         
-        return AccuracyStats(
-            total_feedback=len(entries),
-            correct_count=correct,
-            incorrect_count=incorrect,
-            accuracy_rate=correct / len(entries),
-            by_system=dict(by_system),
-            top_misdiagnoses=misdiagnoses[:5],
-            recent_accuracy=recent_accuracy
-        )
+        # Fold the entries into the aggregates only if nothing else appended
+        # since they were built; otherwise the next stats call rescans.
+        if self._stats is not None and start == self._synced_size:
+            for e in entries:
+                self._stats.add(e.model_dump(mode="json"))
+            self._synced_size = end
+    
+    def _sync_stats(self) -> "_RunningStats":
+        """Return the running aggregates, rescanning if storage changed externally."""
+        self.flush()
+        size = self._size()
+        if self._stats is None or size != self._synced_size:
+            stats = _RunningStats()
+            for e in self._iter_entries():
+                stats.add(e)
+            self._stats, self._synced_size = stats, size
+        return self._stats
+    
+    def get_accuracy_stats(self) -> AccuracyStats:
+        """Return accuracy statistics from the running aggregates."""
+        return self._sync_stats().snapshot()
     
     def get_corrections_for_retraining(self) -> List[dict]:
         """
@@ -157,9 +330,8 @@ class FeedbackStore:
         
         Returns entries where technician provided actual resolution.
         """
-        entries = self._load()
         return [
-            e for e in entries 
+            e for e in self._iter_entries()
             if not e.get("was_correct") and e.get("actual_resolution")
         ]
 
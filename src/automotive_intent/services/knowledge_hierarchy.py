@@ -4,7 +4,10 @@ Implements source prioritization for RAG retrieval.
 TSB > Recall > Manual > General
 """
 import logging
-from typing import List, Dict, Any
+import sys
+import time
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -29,6 +32,33 @@ SOURCE_HIERARCHY = {
     "community": SourcePriority("community", 6, "Community/forum knowledge"),
 }
 
+# Flattened source_type -> priority for the per-document hot path.
+# Keys are interned so lookups with interned metadata values hit on identity.
+SOURCE_PRIORITY: Dict[str, int] = {
+    sys.intern(source_type): info.priority for source_type, info in SOURCE_HIERARCHY.items()
+}
+DEFAULT_PRIORITY = SOURCE_PRIORITY["general"]
+
+
+def normalize_source_type(source_type: str) -> str:
+    """Lower-case and intern a source_type once, where documents enter the system."""
+    return sys.intern(source_type.lower())
+
+
+# (epoch second, formatted local time) of the last audit timestamp
+_iso_second_cache: Tuple[int, str] = (-1, "")
+
+
+def _iso_now() -> str:
+    """Same string as datetime.now().isoformat(); date/time formatting is redone once per second."""
+    global _iso_second_cache
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, prefix = _iso_second_cache
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec).isoformat()
+        _iso_second_cache = (sec, prefix)
+    return f"{prefix}.{us:06d}" if us else prefix
+
 
 class KnowledgeHierarchy:
     """
@@ -42,6 +72,7 @@ class KnowledgeHierarchy:
     
     def __init__(self):
         self.hierarchy = SOURCE_HIERARCHY
+        self.priorities = SOURCE_PRIORITY
     
     def rerank(
         self, 
@@ -61,23 +92,28 @@ class KnowledgeHierarchy:
         if not documents:
             return documents
         
+        now = datetime.now()
+        priorities = self.priorities
+        
         # Step 1: Assign priority scores
         scored = []
         for doc in documents:
             metadata = doc.get("metadata", {})
-            source_type = metadata.get("source_type", "general").lower()
+            source_type = metadata.get("source_type", "general")
             effective_date = metadata.get("effective_date")
             
-            # Base priority from hierarchy
-            priority_info = self.hierarchy.get(source_type, self.hierarchy["general"])
-            base_priority = priority_info.priority
+            # Base priority from hierarchy (normalized values skip the lower())
+            base_priority = priorities.get(source_type)
+            if base_priority is None:
+                source_type = source_type.lower()
+                base_priority = priorities.get(source_type, DEFAULT_PRIORITY)
             
             # Date boost: newer documents get lower (better) priority within same type
             date_boost = 0
             if effective_date:
                 try:
                     doc_date = datetime.fromisoformat(effective_date)
-                    days_old = (datetime.now() - doc_date).days
+                    days_old = (now - doc_date).days
                     date_boost = min(days_old / 365, 1)  # Up to 1 point penalty for old docs
                 except:
                     pass
@@ -92,7 +128,7 @@ class KnowledgeHierarchy:
             })
         
         # Step 2: Sort by priority
-        scored.sort(key=lambda x: x["_priority"])
+        scored.sort(key=itemgetter("_priority"))
         
         # Step 3: Detect and resolve conflicts
         if topic:
@@ -155,7 +191,7 @@ class KnowledgeHierarchy:
                 }
                 for d in documents
             ],
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_now(),
         }
 
 
@@ -151,16 +151,17 @@ class InputNormalizer:
         
         # Step 1: Apply typo patterns
         for pattern, replacement in self.typo_patterns:
-            if pattern.search(text):
-                text = pattern.sub(replacement, text)
+            text, count = pattern.subn(replacement, text)
+            if count:
                 changes.append(f"typo: {pattern.pattern} -> {replacement}")
         
-        # Step 2: Expand abbreviations
+        # Step 2: Expand abbreviations (single pass over the fused pattern)
         abbreviations_found = []
+        abbreviations = self.abbreviations
         
         def replace_abbr(match):
             abbr = match.group(0).lower()
-            expansion = self.abbreviations.get(abbr, abbr)
+            expansion = abbreviations.get(abbr, abbr)
             if abbr != expansion:
                 abbreviations_found.append((abbr, expansion))
             return expansion
@@ -0,0 +1,53 @@
+"""
+Parts Dependency Graph
+Mandatory/recommended parts per repair job, loaded from data/parts_graph.json.
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+# Optional: orjson parses several times faster than the stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Optional: ijson streams a single entry without parsing the whole file
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+PARTS_GRAPH_PATH = Path(__file__).parent.parent.parent.parent / "data" / "parts_graph.json"
+
+
+@lru_cache(maxsize=1)
+def load_parts_graph() -> Mapping[str, Any]:
+    """
+    Return the parts graph, parsed once per process.
+    
+    The top level is a read-only view; the nested entries are shared across
+    callers and must not be mutated.
+    """
+    return MappingProxyType(_json_loads(PARTS_GRAPH_PATH.read_bytes()))
+
+
+def get_part(name: str) -> Optional[Any]:
+    """
+    Return one job's entry, or None if it is not in the graph.
+    
+    Served from the cached graph once it is loaded; before that, streamed
+    with ijson (when installed) so a single probe doesn't parse every entry.
+    """
+    if load_parts_graph.cache_info().currsize or not IJSON_AVAILABLE:
+        return load_parts_graph().get(name)
+    
+    with PARTS_GRAPH_PATH.open("rb") as f:
+        for key, value in ijson.kvitems(f, "", use_float=True):
+            if key == name:
+                return value
+    return None
@@ -9,6 +9,14 @@ from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Optional: Hyperscan scans all PII patterns simultaneously in one DFA pass
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+    logger.info("hyperscan not installed. PII scanning uses the re engine only.")
+
 
 @dataclass
 class RedactionResult:
@@ -79,6 +87,66 @@ REDACTION_MASKS = {
 }
 
 
+def _compile_each(patterns: Dict[str, List[str]]) -> Dict[str, List[re.Pattern]]:
+    """Compile every PII pattern on its own, keeping type and pattern order."""
+    return {
+        pii_type: [re.compile(p, re.IGNORECASE) for p in pattern_list]
+        for pii_type, pattern_list in patterns.items()
+    }
+
+
+def _compile_combined(patterns: Dict[str, List[str]]) -> re.Pattern:
+    """
+    Fuse all PII patterns into one alternation. Only used to find whether
+    (and where) any PII occurs; redaction itself stays one pass per pattern.
+    """
+    return re.compile(
+        "|".join(f"(?:{p})" for pattern_list in patterns.values() for p in pattern_list),
+        re.IGNORECASE
+    )
+
+
+def _compile_hyperscan(patterns: Dict[str, List[str]]):
+    """
+    Compile every PII pattern into one Hyperscan database (block mode, with
+    start-of-match reporting). Returns None if Hyperscan is unavailable or
+    rejects a pattern, in which case callers stay on the re engine.
+    
+    Hyperscan does not support \\b in Unicode mode, so the database is ASCII
+    and only used for text where ASCII and Unicode classes agree.
+    """
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    expressions = [
+        pattern.encode("utf-8")
+        for pattern_list in patterns.values()
+        for pattern in pattern_list
+    ]
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[flags] * len(expressions),
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Hyperscan compile failed, using re engine: {e}")
+        return None
+
+
+# Characters outside this set make ASCII \d/\s/\b differ from re's Unicode
+# semantics (e.g. Devanagari digits, non-breaking spaces); such text uses re
+_NON_HS_TEXT = re.compile(r"[^\t\n\r\x20-\x7e]")
+
+# Default patterns, fused gate (and Hyperscan database), compiled once per process
+_COMPILED = _compile_each(PII_PATTERNS)
+_COMBINED = _compile_combined(PII_PATTERNS)
+_HS_DATABASE = _compile_hyperscan(PII_PATTERNS)
+
+
 class PIIRedactor:
     """
     Redacts PII from text using regex patterns.
@@ -95,12 +163,35 @@ class PIIRedactor:
         self._compile_patterns()
     
     def _compile_patterns(self):
-        """Pre-compile regex patterns for efficiency."""
-        self.compiled = {}
-        for pii_type, pattern_list in self.patterns.items():
-            self.compiled[pii_type] = [
-                re.compile(p, re.IGNORECASE) for p in pattern_list
-            ]
+        """Use the shared compiled patterns unless custom patterns were given."""
+        if self.patterns is PII_PATTERNS:
+            self.compiled = _COMPILED
+            self.combined = _COMBINED
+            self.hs_database = _HS_DATABASE
+        else:
+            self.compiled = _compile_each(self.patterns)
+            self.combined = _compile_combined(self.patterns)
+            self.hs_database = _compile_hyperscan(self.patterns)
+    
+    def _has_match(self, text: str) -> bool:
+        """
+        Whether any PII pattern matches, stopping at the first hit.
+        Uses one Hyperscan pass when available, otherwise the fused regex.
+        """
+        if self.hs_database is None or _NON_HS_TEXT.search(text):
+            return self.combined.search(text) is not None
+        
+        found = []
+        
+        def on_match(pattern_id, start, end, flags, context):
+            found.append(pattern_id)
+            return True  # terminate the scan
+        
+        try:
+            self.hs_database.scan(text.encode("ascii"), match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+        return bool(found)
     
     def redact(self, text: str) -> RedactionResult:
         """
@@ -115,23 +206,29 @@ class PIIRedactor:
         if not text:
             return RedactionResult(redacted_text="", pii_found=[], redaction_count=0)
         
+        # Nothing matches anywhere: skip the per-pattern passes entirely
+        if not self._has_match(text):
+            return RedactionResult(redacted_text=text, pii_found=[], redaction_count=0)
+        
         pii_found = []
         redacted = text
         
+        # One pass per pattern, in type order, each over the previous output.
+        # The order matters: e.g. a PAN must be masked before the
+        # case-insensitive name pattern can swallow its letters.
         for pii_type, patterns in self.compiled.items():
             mask = self.masks.get(pii_type, "[REDACTED]")
             
+            def replace_pii(match, pii_type=pii_type, mask=mask):
+                # Record what was found (partially masked for logging)
+                pii_found.append({
+                    "type": pii_type,
+                    "preview": self._partial_mask(match.group(0)),
+                })
+                return mask
+            
             for pattern in patterns:
-                matches = pattern.findall(redacted)
-                for match in matches:
-                    # Record what was found (partially masked for logging)
-                    pii_found.append({
-                        "type": pii_type,
-                        "preview": self._partial_mask(match),
-                    })
-                
-                # Replace all occurrences
-                redacted = pattern.sub(mask, redacted)
+                redacted = pattern.sub(replace_pii, redacted)
         
         result = RedactionResult(
             redacted_text=redacted,
@@ -144,6 +241,16 @@ class PIIRedactor:
         
         return result
     
+    def redact_batch(self, texts: List[str]) -> List[RedactionResult]:
+        """
+        Redact a batch of texts with the shared compiled patterns.
+        
+        Runs sequentially: the re engine holds the GIL while matching, so
+        threads would only add dispatch overhead.
+        """
+        redact = self.redact
+        return [redact(text) for text in texts]
+    
     def _partial_mask(self, value: str) -> str:
         """Create a partial mask for logging (show first/last chars only)."""
         if len(value) <= 4:
@@ -157,12 +264,12 @@ class PIIRedactor:
         """
         if len(vin) != 17:
             return vin
-        return vin[:3] + "**********" + vin[-4:]
+        # Single BUILD_STRING instead of two intermediate concatenations
+        return f"{vin[:3]}**********{vin[-4:]}"
     
     def is_safe(self, text: str) -> bool:
-        """Check if text contains no detectable PII."""
-        result = self.redact(text)
-        return result.redaction_count == 0
+        """Check if text contains no detectable PII (stops at the first match)."""
+        return not text or not self._has_match(text)
 
 
 # Singleton
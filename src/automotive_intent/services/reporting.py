@@ -44,20 +44,20 @@ class ReportGenerator:
         
         # Title
         elements.append(Paragraph("Automotive Diagnostic Job Card", title_style))
-        elements.append(Paragraph(f"Ticket ID: {ticket.request_id}", styles['Normal']))
+        elements.append(Paragraph(f"Ticket ID: {ticket.ticket_id}", styles['Normal']))
         elements.append(Paragraph(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
         elements.append(Spacer(1, 20))
         
         # Complaint Section
         elements.append(Paragraph("1. Customer Complaint", header_style))
-        elements.append(Paragraph(f"<i>Current Issue:</i> {ticket.original_complaint}", styles['Normal']))
+        elements.append(Paragraph(f"<i>Current Issue:</i> {ticket.meta.original_text}", styles['Normal']))
         elements.append(Spacer(1, 15))
         
         # Diagnosis Section
         elements.append(Paragraph("2. System Diagnosis", header_style))
         
-        if ticket.classification and ticket.classification.primary_intent:
-            intent = ticket.classification.primary_intent
+        if ticket.intent:
+            intent = ticket.intent
             diag_data = [
                 ['System', intent.system],
                 ['Component', intent.component],
@@ -82,8 +82,8 @@ class ReportGenerator:
         
         # Action Plan
         elements.append(Paragraph("3. Recommended Action", header_style))
-        if ticket.normalization:
-            action = ticket.normalization.suggested_action
+        if ticket.triage:
+            action = ticket.triage.suggested_action
             elements.append(Paragraph(action, styles['Normal']))
         else:
             elements.append(Paragraph("Inspect identified component.", styles['Normal']))
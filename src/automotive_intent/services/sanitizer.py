@@ -4,7 +4,7 @@ Protects against prompt injection and malicious inputs.
 """
 import re
 import logging
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -56,6 +56,27 @@ SUSPICIOUS_PATTERNS = [
 # Maximum input length
 MAX_INPUT_LENGTH = 2000
 
+# Compiled once at import and shared by every sanitizer instance
+_COMPILED_INJECTION = [
+    (re.compile(pattern, re.IGNORECASE), name)
+    for pattern, name in INJECTION_PATTERNS
+]
+_COMPILED_SUSPICIOUS = [
+    (re.compile(pattern), name)
+    for pattern, name in SUSPICIOUS_PATTERNS
+]
+
+# Fused single-pass prefilter: clean input (the common case) is cleared with
+# one scan; per-pattern checks only run when something matched
+_INJECTION_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern, _ in INJECTION_PATTERNS),
+    re.IGNORECASE,
+)
+_SUSPICIOUS_RE = re.compile("|".join(f"(?:{pattern})" for pattern, _ in SUSPICIOUS_PATTERNS))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_REPEATED_SPECIAL_RE = re.compile(r'([^\w\s])\1{3,}')
+
 
 class InputSanitizer:
     """
@@ -67,15 +88,9 @@ class InputSanitizer:
         self._compile_patterns()
     
     def _compile_patterns(self):
-        """Pre-compile regex patterns for performance."""
-        self.compiled_injection = [
-            (re.compile(pattern, re.IGNORECASE), name)
-            for pattern, name in INJECTION_PATTERNS
-        ]
-        self.compiled_suspicious = [
-            (re.compile(pattern), name)
-            for pattern, name in SUSPICIOUS_PATTERNS
-        ]
+        """Bind the module-level compiled patterns."""
+        self.compiled_injection = _COMPILED_INJECTION
+        self.compiled_suspicious = _COMPILED_SUSPICIOUS
     
     def sanitize(self, text: str) -> SanitizationResult:
         """
@@ -94,23 +109,25 @@ class InputSanitizer:
             risk_score += 0.1
         
         # Check for injection patterns
-        for pattern, pattern_name in self.compiled_injection:
-            if pattern.search(text):
-                warnings.append(f"Potential prompt injection detected: {pattern_name}")
-                risk_score += 0.3
-                
-                if self.strict_mode:
-                    # Remove the matched pattern
-                    text = pattern.sub("[REMOVED]", text)
+        if _INJECTION_RE.search(text):
+            for pattern, pattern_name in self.compiled_injection:
+                if pattern.search(text):
+                    warnings.append(f"Potential prompt injection detected: {pattern_name}")
+                    risk_score += 0.3
+                    
+                    if self.strict_mode:
+                        # Remove the matched pattern
+                        text = pattern.sub("[REMOVED]", text)
         
         # Check for suspicious encodings
-        for pattern, pattern_name in self.compiled_suspicious:
-            if pattern.search(text):
-                warnings.append(f"Suspicious encoding detected: {pattern_name}")
-                risk_score += 0.2
-                
-                # Remove suspicious characters
-                text = pattern.sub("", text)
+        if _SUSPICIOUS_RE.search(text):
+            for pattern, pattern_name in self.compiled_suspicious:
+                if pattern.search(text):
+                    warnings.append(f"Suspicious encoding detected: {pattern_name}")
+                    risk_score += 0.2
+                    
+                    # Remove suspicious characters
+                    text = pattern.sub("", text)
         
         # Basic cleanup
         sanitized = self._basic_cleanup(text)
@@ -132,13 +149,13 @@ class InputSanitizer:
     def _basic_cleanup(self, text: str) -> str:
         """Basic text cleanup."""
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         
         # Remove leading/trailing whitespace
         text = text.strip()
         
         # Limit consecutive special characters
-        text = re.sub(r'([^\w\s])\1{3,}', r'\1\1\1', text)
+        text = _REPEATED_SPECIAL_RE.sub(r'\1\1\1', text)
         
         return text
     
@@ -169,12 +186,12 @@ class InputSanitizer:
         return is_automotive, confidence
 
 
-# Singleton
-_sanitizer = None
+# Singletons, one per mode
+_sanitizers: Dict[bool, InputSanitizer] = {}
 
 
 def get_sanitizer(strict_mode: bool = False) -> InputSanitizer:
-    global _sanitizer
-    if _sanitizer is None:
-        _sanitizer = InputSanitizer(strict_mode=strict_mode)
-    return _sanitizer
+    sanitizer = _sanitizers.get(strict_mode)
+    if sanitizer is None:
+        sanitizer = _sanitizers[strict_mode] = InputSanitizer(strict_mode=strict_mode)
+    return sanitizer
@@ -3,7 +3,6 @@ Audio Transcription Service
 Uses Groq's Distil-Whisper model for fast speech-to-text.
 """
 import logging
-import io
 from typing import Optional
 from groq import Groq
 from ..config import config
@@ -38,10 +37,7 @@ class AudioTranscriber:
             return ""
             
         try:
-            # Create file-like object
-            audio_file = io.BytesIO(audio_bytes)
-            audio_file.name = filename
-            
+            # Raw bytes go straight into the multipart upload
             transcription = self.client.audio.transcriptions.create(
                 file=(filename, audio_bytes),
                 model="whisper-large-v3",  # Updated from deprecated distil-whisper
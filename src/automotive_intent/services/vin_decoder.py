@@ -4,8 +4,9 @@ Extracts vehicle metadata from VIN for variant-specific RAG filtering.
 """
 import re
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 from dataclasses import dataclass
+from functools import cached_property
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +24,12 @@ class VehicleInfo:
     drive_type: Optional[str] = None  # FWD, RWD, AWD
     fuel_type: Optional[str] = None  # Petrol, Diesel, CNG, Electric
     
-    def get_filter_tags(self) -> list:
-        """Return list of tags for RAG filtering."""
+    @cached_property
+    def filter_tags(self) -> Tuple[str, ...]:
+        """Tags for RAG filtering, built on first access (set fields before reading)."""
         tags = []
         if self.make:
-            tags.append(f"make:{self.make.lower()}")
+            tags.append(_MAKE_TAGS.get(self.make) or f"make:{self.make.lower()}")
         if self.model:
             tags.append(f"model:{self.model.lower()}")
         if self.engine:
@@ -35,14 +37,12 @@ class VehicleInfo:
         if self.fuel_type:
             tags.append(f"fuel:{self.fuel_type.lower()}")
         if self.year:
-            # Generation grouping
-            if self.year >= 2020:
-                tags.append("gen:current")
-            elif self.year >= 2015:
-                tags.append("gen:previous")
-            else:
-                tags.append("gen:legacy")
-        return tags
+            tags.append(_GEN_TAGS.get(self.year) or _generation_tag(self.year))
+        return tuple(tags)
+    
+    def get_filter_tags(self) -> list:
+        """Return list of tags for RAG filtering."""
+        return list(self.filter_tags)
 
 
 # VIN character to year mapping (position 10)
@@ -85,12 +85,37 @@ WMI_TO_MAKE = {
     "WVW": "Volkswagen",
 }
 
+
+def _generation_tag(year: int) -> str:
+    """Generation grouping used for filtering."""
+    if year >= 2020:
+        return "gen:current"
+    elif year >= 2015:
+        return "gen:previous"
+    return "gen:legacy"
+
+
+# Tags for the closed value sets the decoder produces, built once
+_MAKE_TAGS = {make: f"make:{make.lower()}" for make in WMI_TO_MAKE.values()}
+_GEN_TAGS = {year: _generation_tag(year) for year in YEAR_CODES.values()}
+
+
+# Legal VIN characters: digits and A-Z except I, O, Q. Translating with this
+# deletion table leaves only illegal characters, so a valid VIN maps to ""
+_VIN_INVALID_ONLY = str.maketrans("", "", "0123456789ABCDEFGHJKLMNPRSTUVWXYZ")
+
 # Indian vehicle registration pattern
 INDIAN_REG_PATTERN = re.compile(
     r'^([A-Z]{2})[\s-]?(\d{1,2})[\s-]?([A-Z]{1,3})[\s-]?(\d{1,4})$',
     re.IGNORECASE
 )
 
+# VIN or registration embedded in free text (e.g. a chat message)
+VIN_OR_REG_SEARCH_PATTERN = re.compile(
+    r'[A-HJ-NPR-Z0-9]{17}|[A-Z]{2}\d{1,2}[A-Z]{1,3}\d{1,4}',
+    re.IGNORECASE
+)
+
 
 class VINDecoder:
     """Decodes VIN to extract vehicle metadata."""
@@ -112,7 +137,7 @@ class VINDecoder:
             return self._decode_indian_reg(vin_or_reg)
         
         # Standard VIN
-        if len(vin_or_reg) == 17:
+        if len(vin_or_reg) == 17 and not vin_or_reg.translate(_VIN_INVALID_ONLY):
             return self._decode_vin(vin_or_reg)
         
         logger.warning(f"Invalid VIN/Registration: {vin_or_reg}")
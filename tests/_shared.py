@@ -0,0 +1,19 @@
+"""
+Memoized heavyweight objects shared by pytest fixtures and script entry points.
+"""
+import functools
+
+from automotive_intent.pipeline import IntentPipeline, create_pipeline
+from automotive_intent.agents.orchestrator import DiagnosticOrchestrator, get_orchestrator
+
+
+@functools.lru_cache(maxsize=1)
+def get_test_pipeline() -> IntentPipeline:
+    """Pipeline without Ollama/NLLB (classification goes through Groq or offline fixtures)."""
+    return create_pipeline(use_ollama=False, use_nllb=False)
+
+
+@functools.lru_cache(maxsize=1)
+def get_test_orchestrator() -> DiagnosticOrchestrator:
+    """Agent orchestrator used by the end-to-end tests."""
+    return get_orchestrator()
@@ -15,6 +15,24 @@ os.environ["AMI_ENV"] = "testing"
 os.environ["AMI_USE_OLLAMA"] = "false"
 os.environ["AMI_USE_NLLB"] = "false"
 
+# Answer LLM calls from data/llm_fixtures.json unless explicitly run online
+# (GARAGEIQ_TEST_MODE=online pytest -m online)
+os.environ.setdefault("GARAGEIQ_TEST_MODE", "offline")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "online: hits live LLM endpoints (set GARAGEIQ_TEST_MODE=online)")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip live-LLM tests in offline mode."""
+    if os.environ["GARAGEIQ_TEST_MODE"] != "offline":
+        return
+    skip_online = pytest.mark.skip(reason="offline test mode (set GARAGEIQ_TEST_MODE=online)")
+    for item in items:
+        if "online" in item.keywords:
+            item.add_marker(skip_online)
+
 
 @pytest.fixture
 def sample_complaints():
@@ -59,6 +77,20 @@ def sample_diagnosis():
     }
 
 
+@pytest.fixture
+def make_intent():
+    """
+    Factory for trusted Intent objects.
+    Skips Pydantic validation; use only where validation is not under test.
+    """
+    from automotive_intent.core.schemas import Intent
+
+    def _make(**kwargs):
+        return Intent.model_construct(**kwargs)
+
+    return _make
+
+
 @pytest.fixture
 def mock_pipeline(monkeypatch):
     """Mock pipeline for fast tests."""
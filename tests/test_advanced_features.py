@@ -2,15 +2,17 @@
 Unit tests for advanced RAG features.
 """
 import pytest
-import json
+
+from automotive_intent.services.knowledge_hierarchy import get_knowledge_hierarchy
+from automotive_intent.services.normalizer import get_normalizer
+from automotive_intent.services.parts_graph import load_parts_graph
+from automotive_intent.services.vin_decoder import get_vin_decoder
 
 
 class TestNormalizer:
     """Tests for noisy input normalization."""
     
     def test_abbreviation_expansion(self):
-        from automotive_intent.services.normalizer import get_normalizer
-        
         normalizer = get_normalizer()
         text, meta = normalizer.normalize("Cus sts frt lft noise")
         
@@ -20,8 +22,6 @@ class TestNormalizer:
         assert meta["changes_made"] >= 3
     
     def test_india_specific_terms(self):
-        from automotive_intent.services.normalizer import get_normalizer
-        
         normalizer = get_normalizer()
         text, _ = normalizer.normalize("gaadi garam ho rahi")
         
@@ -29,8 +29,6 @@ class TestNormalizer:
         assert "hot" in text.lower()
     
     def test_no_changes_clean_input(self):
-        from automotive_intent.services.normalizer import get_normalizer
-        
         normalizer = get_normalizer()
         _, meta = normalizer.normalize("The engine is overheating")
         
@@ -41,8 +39,6 @@ class TestVINDecoder:
     """Tests for VIN/Registration decoder."""
     
     def test_indian_registration(self):
-        from automotive_intent.services.vin_decoder import get_vin_decoder
-        
         decoder = get_vin_decoder()
         info = decoder.decode("MH12AB1234")
         
@@ -50,8 +46,6 @@ class TestVINDecoder:
         assert info.vin == "MH12AB1234"
     
     def test_invalid_vin(self):
-        from automotive_intent.services.vin_decoder import get_vin_decoder
-        
         decoder = get_vin_decoder()
         info = decoder.decode("INVALID")
         
@@ -62,16 +56,14 @@ class TestPartsGraph:
     """Tests for parts dependency graph."""
     
     def test_water_pump_dependencies(self):
-        with open("data/parts_graph.json") as f:
-            graph = json.load(f)
+        graph = load_parts_graph()
         
         assert "water_pump" in graph
         assert "water_pump_gasket" in graph["water_pump"]["mandatory"]
         assert "coolant" in graph["water_pump"]["mandatory"]
     
     def test_brake_pads_recommendations(self):
-        with open("data/parts_graph.json") as f:
-            graph = json.load(f)
+        graph = load_parts_graph()
         
         assert "brake_pads_front" in graph
         assert "brake_rotors_front" in graph["brake_pads_front"]["recommended"]
@@ -81,8 +73,6 @@ class TestKnowledgeHierarchy:
     """Tests for TSB override logic."""
     
     def test_tsb_supersedes_manual(self):
-        from automotive_intent.services.knowledge_hierarchy import get_knowledge_hierarchy
-        
         hierarchy = get_knowledge_hierarchy()
         
         docs = [
@@ -96,8 +86,6 @@ class TestKnowledgeHierarchy:
         assert ranked[0]["metadata"]["source_type"] == "tsb"
     
     def test_recall_highest_priority(self):
-        from automotive_intent.services.knowledge_hierarchy import get_knowledge_hierarchy
-        
         hierarchy = get_knowledge_hierarchy()
         
         docs = [
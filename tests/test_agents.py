@@ -184,6 +184,67 @@ class TestFeedbackService:
             assert record.id is not None
 
 
+class TestOrchestratorSessions:
+    """Tests for bounded agent session storage."""
+    
+    def test_least_recently_used_session_evicted(self):
+        """Test that the oldest session is evicted once the cap is reached."""
+        from automotive_intent.agents.orchestrator import DiagnosticOrchestrator
+        from automotive_intent.agents.state import ChatRequest
+        
+        orchestrator = DiagnosticOrchestrator(max_sessions=2)
+        first = orchestrator.process_message(ChatRequest(message="brake noise"))
+        second = orchestrator.process_message(ChatRequest(message="engine overheating"))
+        
+        # Touch the first session so the second becomes least recently used
+        orchestrator.process_message(ChatRequest(message="only when stopping", session_id=first.session_id))
+        third = orchestrator.process_message(ChatRequest(message="battery dead"))
+        
+        assert orchestrator.get_session(first.session_id) is not None
+        assert orchestrator.get_session(second.session_id) is None
+        assert orchestrator.get_session(third.session_id) is not None
+
+    def test_stream_message_reports_steps(self):
+        """Test that streaming yields each agent step before the final response."""
+        from automotive_intent.agents.orchestrator import DiagnosticOrchestrator
+        from automotive_intent.agents.state import ChatRequest, ChatResponse
+        
+        orchestrator = DiagnosticOrchestrator(max_sessions=2)
+        events = list(orchestrator.stream_message(ChatRequest(message="brake noise")))
+        steps = [node for node, _ in events[:-1]]
+        node, response = events[-1]
+        
+        assert steps[:3] == ["symptom_analyst", "context_retrieval", "diagnosis"]
+        assert steps[-1] == "respond"
+        assert node == "done" and isinstance(response, ChatResponse)
+        assert orchestrator.get_session(response.session_id) is not None
+
+    def test_context_node_merges_parallel_agents(self):
+        """Test that parallel retrieval keeps each agent's own output."""
+        from automotive_intent.agents.orchestrator import DiagnosticOrchestrator
+        from automotive_intent.agents.state import AgentState, SimilarTicket
+        
+        orchestrator = DiagnosticOrchestrator(max_sessions=2)
+        ticket = SimilarTicket(
+            ticket_id="T-1", complaint="brake noise", system="BRAKES",
+            component="PADS_ROTORS", failure_mode="SQUEALING",
+            resolution="Replaced pads", similarity_score=0.9
+        )
+        
+        def historian(state):
+            return dict(state, similar_tickets=[ticket.model_dump()])
+        
+        def knowledge(state):
+            return dict(state, retrieval_audit={"retrieved_count": 0})
+        
+        with patch.object(orchestrator, "_historian_node", historian), \
+             patch.object(orchestrator, "_knowledge_node", knowledge):
+            result = AgentState(**orchestrator._context_node(AgentState(current_input="brake noise").model_dump()))
+        
+        assert result.similar_tickets == [ticket]
+        assert result.retrieval_audit == {"retrieved_count": 0}
+
+
 class TestABTesting:
     """Tests for A/B testing framework."""
     
@@ -4,6 +4,17 @@ Tests for API endpoints and pipeline.
 import pytest
 from fastapi.testclient import TestClient
 
+from automotive_intent.app import _response_cache, app
+from automotive_intent.core.ontology import SERVICE_ONTOLOGY
+from automotive_intent.core.schemas import (
+    ClassificationRequest,
+    Intent,
+    RequestMeta,
+    ServiceTicket,
+    Triage,
+)
+from automotive_intent.pipeline import TriageEngine, create_pipeline
+
 
 # =============================================================================
 # PIPELINE TESTS
@@ -14,16 +25,17 @@ class TestPipeline:
     
     def test_pipeline_creation(self):
         """Test that pipeline can be created."""
-        from automotive_intent.pipeline import create_pipeline
-        
         pipeline = create_pipeline(use_ollama=False, use_nllb=False)
         assert pipeline is not None
-    
+
+    def test_pipeline_is_cached(self):
+        """Test that repeated creation with the same flags reuses the instance."""
+        first = create_pipeline(use_ollama=False, use_nllb=False)
+        second = create_pipeline(use_ollama=False, use_nllb=False)
+        assert first is second
+
     def test_english_classification(self):
         """Test English complaint classification."""
-        from automotive_intent.pipeline import create_pipeline
-        from automotive_intent.core.schemas import ClassificationRequest
-        
         pipeline = create_pipeline(use_ollama=False, use_nllb=False)
         ticket = pipeline.process(ClassificationRequest(text="Brake noise when stopping"))
         
@@ -31,9 +43,6 @@ class TestPipeline:
     
     def test_normalizer_integration(self):
         """Test that normalizer is applied in pipeline."""
-        from automotive_intent.pipeline import create_pipeline
-        from automotive_intent.core.schemas import ClassificationRequest
-        
         pipeline = create_pipeline(use_ollama=False, use_nllb=False)
         ticket = pipeline.process(ClassificationRequest(text="cus sts brk noise frt"))
         
@@ -52,8 +61,6 @@ class TestSchemas:
     
     def test_intent_creation(self):
         """Test Intent model creation."""
-        from automotive_intent.core.schemas import Intent
-        
         intent = Intent(
             system="BRAKES",
             component="PADS_ROTORS",
@@ -66,15 +73,11 @@ class TestSchemas:
     
     def test_classification_request(self):
         """Test ClassificationRequest model."""
-        from automotive_intent.core.schemas import ClassificationRequest
-        
         req = ClassificationRequest(text="Test complaint")
         assert req.text == "Test complaint"
     
-    def test_service_ticket_creation(self):
+    def test_service_ticket_creation(self, make_intent):
         """Test ServiceTicket model creation."""
-        from automotive_intent.core.schemas import ServiceTicket, RequestMeta, Intent, Triage
-        
         ticket = ServiceTicket(
             classification_status="CONFIRMED",
             meta=RequestMeta(
@@ -82,7 +85,7 @@ class TestSchemas:
                 detected_language="en",
                 timestamp_utc="2024-01-01T00:00:00Z"
             ),
-            intent=Intent(
+            intent=make_intent(
                 system="BRAKES",
                 component="PADS_ROTORS",
                 failure_mode="SQUEALING",
@@ -107,8 +110,6 @@ class TestOntology:
     
     def test_ontology_structure(self):
         """Test that ontology has expected systems."""
-        from automotive_intent.core.ontology import SERVICE_ONTOLOGY
-        
         assert "BRAKES" in SERVICE_ONTOLOGY
         assert "ELECTRICAL" in SERVICE_ONTOLOGY
         assert "HVAC" in SERVICE_ONTOLOGY
@@ -116,16 +117,12 @@ class TestOntology:
     
     def test_brakes_components(self):
         """Test brake system has expected components."""
-        from automotive_intent.core.ontology import SERVICE_ONTOLOGY
-        
         brakes = SERVICE_ONTOLOGY["BRAKES"]
         assert "PADS_ROTORS" in brakes
         assert "BRAKE_FLUID" in brakes
     
     def test_failure_modes_exist(self):
         """Test that failure modes are defined."""
-        from automotive_intent.core.ontology import SERVICE_ONTOLOGY
-        
         brakes = SERVICE_ONTOLOGY["BRAKES"]
         pads = brakes["PADS_ROTORS"]
         
@@ -134,8 +131,6 @@ class TestOntology:
     
     def test_ontology_validation(self):
         """Test ontology structure has proper nesting."""
-        from automotive_intent.core.ontology import SERVICE_ONTOLOGY
-        
         # Check that paths exist in ontology
         assert "PADS_ROTORS" in SERVICE_ONTOLOGY["BRAKES"]
         assert "SQUEALING" in SERVICE_ONTOLOGY["BRAKES"]["PADS_ROTORS"]
@@ -151,7 +146,6 @@ class TestAPIEndpoints:
     @pytest.fixture
     def client(self):
         """Create test client."""
-        from automotive_intent.app import app
         return TestClient(app)
     
     def test_health_endpoint(self, client):
@@ -161,6 +155,12 @@ class TestAPIEndpoints:
         data = response.json()
         assert "status" in data
     
+    def test_health_endpoint_cached(self, client):
+        """Test that health payloads are served from the TTL cache."""
+        first = client.get("/health")
+        assert "health" in _response_cache
+        assert client.get("/health").content == first.content
+    
     def test_root_endpoint(self, client):
         """Test root endpoint."""
         response = client.get("/")
@@ -176,6 +176,14 @@ class TestAPIEndpoints:
         data = response.json()
         assert "ontology" in data
     
+    def test_ontology_endpoint_cached_body(self, client):
+        """Test that the cached ontology body is served consistently as JSON."""
+        first = client.get("/v1/ontology")
+        second = client.get("/v1/ontology")
+        assert first.headers["content-type"] == "application/json"
+        assert first.content == second.content
+        assert "BRAKES" in second.json()["ontology"]
+    
     def test_config_endpoint(self, client):
         """Test config endpoint."""
         response = client.get("/v1/config")
@@ -183,7 +191,18 @@ class TestAPIEndpoints:
         data = response.json()
         assert "environment" in data
     
-    def test_feedback_stats_endpoint(self, client):
+    @pytest.fixture
+    def feedback_store(self, tmp_path, monkeypatch):
+        """Point the feedback endpoints at a private store instead of data/."""
+        from automotive_intent.services import feedback_loop
+        
+        store = feedback_loop.FeedbackStore(storage_path=tmp_path / "feedback.jsonl")
+        monkeypatch.setattr(feedback_loop, "_store", store)
+        _response_cache.pop("feedback_stats", None)
+        yield store
+        _response_cache.pop("feedback_stats", None)
+    
+    def test_feedback_stats_endpoint(self, client, feedback_store):
         """Test feedback stats endpoint."""
         response = client.get("/v1/feedback/stats")
         assert response.status_code == 200
@@ -199,13 +218,10 @@ class TestAPIEndpoints:
 class TestTriageEngine:
     """Tests for severity and vehicle state determination."""
     
-    def test_critical_severity(self):
+    def test_critical_severity(self, make_intent):
         """Test that critical failure modes get critical severity."""
-        from automotive_intent.pipeline import TriageEngine
-        from automotive_intent.core.schemas import Intent
-        
         # Use a valid ontology path
-        intent = Intent(
+        intent = make_intent(
             system="ELECTRICAL",
             component="BATTERY",
             failure_mode="DEAD_CELL",
@@ -215,12 +231,9 @@ class TestTriageEngine:
         severity = TriageEngine.determine_severity(intent)
         assert severity == "CRITICAL"
     
-    def test_high_severity_brakes(self):
+    def test_high_severity_brakes(self, make_intent):
         """Test that brake issues are high severity."""
-        from automotive_intent.pipeline import TriageEngine
-        from automotive_intent.core.schemas import Intent
-        
-        intent = Intent(
+        intent = make_intent(
             system="BRAKES",
             component="PADS_ROTORS",
             failure_mode="SQUEALING",
@@ -230,12 +243,9 @@ class TestTriageEngine:
         severity = TriageEngine.determine_severity(intent)
         assert severity == "HIGH"
     
-    def test_vehicle_state_immobilized(self):
+    def test_vehicle_state_immobilized(self, make_intent):
         """Test immobilized vehicle state."""
-        from automotive_intent.pipeline import TriageEngine
-        from automotive_intent.core.schemas import Intent
-        
-        intent = Intent(
+        intent = make_intent(
             system="ELECTRICAL",
             component="BATTERY",
             failure_mode="DEAD_CELL",
@@ -245,6 +255,13 @@ class TestTriageEngine:
         state = TriageEngine.determine_vehicle_state(intent)
         assert state == "IMMOBILIZED"
 
+    def test_triage_table_covers_ontology(self):
+        """Test that every ontology path has a precomputed triage entry."""
+        for system, components in SERVICE_ONTOLOGY.items():
+            for component, modes in components.items():
+                for mode in modes:
+                    assert (system, component, mode) in TriageEngine._TRIAGE_TABLE
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -10,11 +10,10 @@ Tests the full pipeline from input to diagnosis, including:
 import pytest
 import time
 import logging
-from automotive_intent.pipeline import create_pipeline
 from automotive_intent.core.schemas import ClassificationRequest
 from automotive_intent.services.sanitizer import get_sanitizer
-from automotive_intent.agents.orchestrator import get_orchestrator
 from automotive_intent.agents.state import ChatRequest
+from _shared import get_test_pipeline, get_test_orchestrator
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -22,18 +21,19 @@ logger = logging.getLogger(__name__)
 
 @pytest.fixture(scope="module")
 def pipeline():
-    """Initialize pipeline once for all tests."""
-    print("\n⚡ Initializing Pipeline...")
-    start = time.time()
-    p = create_pipeline(use_ollama=False, use_nllb=False)  # Uses Groq
-    print(f"Pipeline ready in {time.time() - start:.2f}s")
-    return p
+    """Shared pipeline (memoized in _shared, also used by the __main__ block)."""
+    return get_test_pipeline()  # Uses Groq
 
 @pytest.fixture(scope="module")
 def orchestrator():
-    """Initialize agent orchestrator."""
-    print("\n🧠 Initializing Agent Orchestrator...")
-    return get_orchestrator()
+    """Shared agent orchestrator singleton."""
+    return get_test_orchestrator()
+
+@pytest.fixture(autouse=True)
+def _cleanup_sessions(orchestrator):
+    """Drop agent sessions created by each test."""
+    yield
+    orchestrator.clear_sessions()
 
 class TestEndToEnd:
     
@@ -42,17 +42,14 @@ class TestEndToEnd:
         text = "My car engine is overheating and temperature gauge is red"
         print(f"\n[EN] Testing: {text}")
         
-        start = time.time()
         result = pipeline.process(ClassificationRequest(text=text))
-        elapsed = time.time() - start
         
-        print(f"Time: {elapsed:.2f}s | Result: {result.intent.system}/{result.intent.failure_mode}")
+        print(f"Result: {result.intent.system}/{result.intent.failure_mode}")
         
         assert result.intent.system == "POWERTRAIN"
         assert result.intent.component == "ENGINE"
         assert result.intent.failure_mode == "OVERHEATING"
         assert result.intent.confidence > 0.7
-        assert elapsed < 2.0  # Groq speed check
 
     def test_hindi_diagnosis(self, pipeline):
         """Test Hindi complaint (transliterated or raw)."""
@@ -82,6 +79,7 @@ class TestEndToEnd:
         assert result.intent.system == "TWO_WHEELER"
         assert result.intent.failure_mode == "SELF_START_FAILURE" or "NO_START" in result.intent.failure_mode
 
+    @pytest.mark.online
     def test_agent_reflection(self, orchestrator):
         """Test if agent loop handles vague input."""
         text = "strange noise"  # Vague
@@ -113,26 +111,23 @@ class TestEndToEnd:
         assert result.is_safe is False
         assert result.risk_score > 0.5
 
-    def test_groq_speed(self, pipeline):
+    @pytest.mark.online
+    def test_groq_speed(self, benchmark, pipeline):
         """Benchmark Groq speed."""
-        text = "Battery is dead"
-        
-        start = time.time()
-        pipeline.process(ClassificationRequest(text=text))
-        elapsed = time.time() - start
+        request = ClassificationRequest(text="Battery is dead")
         
-        print(f"\n[PERF] Diagnosis time: {elapsed:.4f}s")
-        assert elapsed < 1.5, "Inference should be under 1.5s with Groq"
+        # Few rounds: every call is a live (rate-limited) inference request
+        ticket = benchmark.pedantic(pipeline.process, args=(request,), rounds=3, iterations=1)
+        assert ticket.intent is not None
 
 if __name__ == "__main__":
-    # Manually run if executed as script
-    p = create_pipeline(use_ollama=False, use_nllb=False)
-    o = get_orchestrator()
+    # Manually run if executed as script (test_groq_speed needs pytest-benchmark)
+    p = get_test_pipeline()
+    o = get_test_orchestrator()
     tester = TestEndToEnd()
     tester.test_english_diagnosis(p)
     tester.test_hindi_diagnosis(p)
     tester.test_india_specific_two_wheeler(p)
     tester.test_agent_reflection(o)
     tester.test_security_sanitization()
-    tester.test_groq_speed(p)
     print("\n✅ All End-to-End Tests Passed!")
@@ -17,68 +17,37 @@ class TestOntologyStructure:
         expected = {"POWERTRAIN", "ELECTRICAL", "HVAC", "BRAKES", "SUSPENSION", "STEERING", "EXHAUST"}
         assert VALID_SYSTEMS == expected
 
-    def test_powertrain_components(self):
-        components = get_valid_components("POWERTRAIN")
-        assert components == {"ENGINE", "TRANSMISSION"}
-
-    def test_electrical_components(self):
-        components = get_valid_components("ELECTRICAL")
-        assert components == {"BATTERY", "STARTER_MOTOR", "ALTERNATOR"}
-
-    def test_hvac_components(self):
-        components = get_valid_components("HVAC")
-        assert components == {"COMPRESSOR", "BLOWER_MOTOR", "HEATER_CORE"}
-
-    def test_brakes_components(self):
-        components = get_valid_components("BRAKES")
-        assert components == {"PADS_ROTORS", "BRAKE_FLUID", "ABS"}
-
-    def test_suspension_components(self):
-        components = get_valid_components("SUSPENSION")
-        assert components == {"SHOCKS_STRUTS", "BALL_JOINTS", "CONTROL_ARMS"}
-
-    def test_steering_components(self):
-        components = get_valid_components("STEERING")
-        assert components == {"POWER_STEERING", "STEERING_RACK", "TIE_RODS"}
-
-    def test_exhaust_components(self):
-        components = get_valid_components("EXHAUST")
-        assert components == {"CATALYTIC_CONVERTER", "MUFFLER", "EXHAUST_MANIFOLD"}
+    @pytest.mark.parametrize("system,expected", [
+        ("POWERTRAIN", {"ENGINE", "TRANSMISSION"}),
+        ("ELECTRICAL", {"BATTERY", "STARTER_MOTOR", "ALTERNATOR"}),
+        ("HVAC", {"COMPRESSOR", "BLOWER_MOTOR", "HEATER_CORE"}),
+        ("BRAKES", {"PADS_ROTORS", "BRAKE_FLUID", "ABS"}),
+        ("SUSPENSION", {"SHOCKS_STRUTS", "BALL_JOINTS", "CONTROL_ARMS"}),
+        ("STEERING", {"POWER_STEERING", "STEERING_RACK", "TIE_RODS"}),
+        ("EXHAUST", {"CATALYTIC_CONVERTER", "MUFFLER", "EXHAUST_MANIFOLD"}),
+    ])
+    def test_components(self, system, expected):
+        assert get_valid_components(system) == expected
 
 
 class TestOntologyValidation:
     """Test the validate_ontology_path function."""
 
-    def test_valid_path_engine_no_start(self):
-        assert validate_ontology_path("POWERTRAIN", "ENGINE", "NO_START") is True
-
-    def test_valid_path_starter_solenoid(self):
-        assert validate_ontology_path("ELECTRICAL", "STARTER_MOTOR", "SOLENOID_CLICK") is True
-
-    def test_valid_path_brakes_squealing(self):
-        assert validate_ontology_path("BRAKES", "PADS_ROTORS", "SQUEALING") is True
-
-    def test_valid_path_suspension_bouncy(self):
-        assert validate_ontology_path("SUSPENSION", "SHOCKS_STRUTS", "BOUNCY_RIDE") is True
-
-    def test_valid_path_steering_stiff(self):
-        assert validate_ontology_path("STEERING", "POWER_STEERING", "STIFF_STEERING") is True
-
-    def test_valid_path_exhaust_loud(self):
-        assert validate_ontology_path("EXHAUST", "MUFFLER", "LOUD_EXHAUST") is True
-
-    def test_invalid_system(self):
-        assert validate_ontology_path("BODY", "DOORS", "STUCK") is False
-
-    def test_invalid_component(self):
-        assert validate_ontology_path("POWERTRAIN", "TURBO", "BOOST_LEAK") is False
-
-    def test_invalid_failure_mode(self):
-        assert validate_ontology_path("ELECTRICAL", "BATTERY", "EXPLODED") is False
-
-    def test_case_sensitivity(self):
+    @pytest.mark.parametrize("system,component,failure_mode,expected", [
+        ("POWERTRAIN", "ENGINE", "NO_START", True),
+        ("ELECTRICAL", "STARTER_MOTOR", "SOLENOID_CLICK", True),
+        ("BRAKES", "PADS_ROTORS", "SQUEALING", True),
+        ("SUSPENSION", "SHOCKS_STRUTS", "BOUNCY_RIDE", True),
+        ("STEERING", "POWER_STEERING", "STIFF_STEERING", True),
+        ("EXHAUST", "MUFFLER", "LOUD_EXHAUST", True),
+        ("BODY", "DOORS", "STUCK", False),  # invalid system
+        ("POWERTRAIN", "TURBO", "BOOST_LEAK", False),  # invalid component
+        ("ELECTRICAL", "BATTERY", "EXPLODED", False),  # invalid failure mode
         # Our ontology is uppercase; lowercase should fail
-        assert validate_ontology_path("powertrain", "engine", "no_start") is False
+        ("powertrain", "engine", "no_start", False),
+    ])
+    def test_validate_path(self, system, component, failure_mode, expected):
+        assert validate_ontology_path(system, component, failure_mode) is expected
 
 
 class TestHelperFunctions:
@@ -35,6 +35,18 @@ class TestIntentValidation:
         assert intent.system == "ELECTRICAL"
         assert intent.component == "STARTER_MOTOR"
 
+    def test_normalized_fields_are_interned(self):
+        """Canonicalized fields should be the interned ontology strings."""
+        import sys
+        intent = Intent(
+            system="electrical",
+            component="starter_motor",
+            failure_mode="solenoid_click",
+            confidence=0.85
+        )
+        assert intent.system is sys.intern("ELECTRICAL")
+        assert intent.failure_mode is sys.intern("SOLENOID_CLICK")
+
     def test_invalid_ontology_path_raises(self):
         """Hallucinated failure mode should fail validation."""
         with pytest.raises(ValidationError) as exc_info:
@@ -100,7 +112,7 @@ class TestServiceTicket:
             )
         assert "intent" in str(exc_info.value).lower() or "triage" in str(exc_info.value).lower()
 
-    def test_confirmed_with_all_fields(self):
+    def test_confirmed_with_all_fields(self, make_intent):
         ticket = ServiceTicket(
             classification_status="CONFIRMED",
             meta=RequestMeta(
@@ -111,7 +123,7 @@ class TestServiceTicket:
                 translated_text="Car is not starting",
                 technical_summary="No-start condition"
             ),
-            intent=Intent(
+            intent=make_intent(
                 system="ELECTRICAL",
                 component="STARTER_MOTOR",
                 failure_mode="NO_CRANK",
@@ -1,11 +1,42 @@
 """
 Tests for all service modules.
-Covers: normalizer, pii_redactor, vin_decoder, feedback_loop, knowledge_hierarchy
+Covers: normalizer, pii_redactor, vin_decoder, feedback_loop, knowledge_hierarchy, embeddings, parts_graph, reporting
 """
+import io
 import pytest
 import json
+import sys
+import re
+import weakref
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from automotive_intent.services.embeddings import _document_header
+from automotive_intent.services.feedback_loop import FeedbackEntry, FeedbackStore, _flush_at_exit
+from automotive_intent.services.knowledge_hierarchy import _iso_now, get_knowledge_hierarchy, normalize_source_type
+from automotive_intent.services.normalizer import get_normalizer
+from automotive_intent.services.parts_graph import get_part, load_parts_graph
+from automotive_intent.services.pii_redactor import (
+    HYPERSCAN_AVAILABLE,
+    PII_PATTERNS,
+    REDACTION_MASKS,
+    PIIRedactor,
+    get_pii_redactor,
+)
+from automotive_intent.services.vin_decoder import VIN_OR_REG_SEARCH_PATTERN, VehicleInfo, get_vin_decoder
+
+
+@pytest.fixture(scope="session")
+def redactor():
+    """Shared PII redactor (patterns compiled once per run)."""
+    return get_pii_redactor()
+
+
+@pytest.fixture(scope="session")
+def decoder():
+    """Shared VIN decoder."""
+    return get_vin_decoder()
+
 
 # =============================================================================
 # NORMALIZER TESTS
@@ -16,8 +47,6 @@ class TestInputNormalizer:
     
     def test_basic_abbreviations(self):
         """Test common automotive abbreviations."""
-        from automotive_intent.services.normalizer import get_normalizer
-        
         normalizer = get_normalizer()
         text, meta = normalizer.normalize("frt lft brk noise")
         
@@ -28,8 +57,6 @@ class TestInputNormalizer:
     
     def test_customer_abbreviations(self):
         """Test service advisor abbreviations."""
-        from automotive_intent.services.normalizer import get_normalizer
-        
         normalizer = get_normalizer()
         text, _ = normalizer.normalize("cus sts veh wont start")
         
@@ -38,8 +65,6 @@ class TestInputNormalizer:
     
     def test_india_specific_terms(self):
         """Test Hindi/Hinglish terms."""
-        from automotive_intent.services.normalizer import get_normalizer
-        
         normalizer = get_normalizer()
         text, _ = normalizer.normalize("gaadi garam ho rahi hai")
         
@@ -48,8 +73,6 @@ class TestInputNormalizer:
     
     def test_no_changes_on_clean_input(self):
         """Test that clean input remains unchanged."""
-        from automotive_intent.services.normalizer import get_normalizer
-        
         normalizer = get_normalizer()
         original = "The engine is overheating and needs repair"
         text, meta = normalizer.normalize(original)
@@ -59,8 +82,6 @@ class TestInputNormalizer:
     
     def test_preserves_technical_terms(self):
         """Test that DTC codes and technical terms are preserved."""
-        from automotive_intent.services.normalizer import get_normalizer
-        
         normalizer = get_normalizer()
         text, _ = normalizer.normalize("P0420 code showing, catalytic converter issue")
         
@@ -74,58 +95,89 @@ class TestInputNormalizer:
 class TestPIIRedactor:
     """Tests for PII detection and redaction."""
     
-    def test_phone_redaction_indian(self):
+    def test_phone_redaction_indian(self, redactor):
         """Test Indian phone number redaction."""
-        from automotive_intent.services.pii_redactor import get_pii_redactor
-        
-        redactor = get_pii_redactor()
         result = redactor.redact("Call customer at +91 9876543210")
         
         assert "[PHONE_REDACTED]" in result.redacted_text
         assert "9876543210" not in result.redacted_text
         assert result.redaction_count >= 1
     
-    def test_email_redaction(self):
+    def test_email_redaction(self, redactor):
         """Test email address redaction."""
-        from automotive_intent.services.pii_redactor import get_pii_redactor
-        
-        redactor = get_pii_redactor()
         result = redactor.redact("Contact: customer@example.com for updates")
         
         assert "[EMAIL_REDACTED]" in result.redacted_text
         assert "customer@example.com" not in result.redacted_text
     
-    def test_aadhaar_redaction(self):
+    def test_aadhaar_redaction(self, redactor):
         """Test Aadhaar number redaction."""
-        from automotive_intent.services.pii_redactor import get_pii_redactor
-        
-        redactor = get_pii_redactor()
         result = redactor.redact("Aadhaar: 1234 5678 9012")
         
         assert "[AADHAAR_REDACTED]" in result.redacted_text
     
-    def test_multiple_pii_types(self):
+    def test_multiple_pii_types(self, redactor):
         """Test redaction of multiple PII types in one text."""
-        from automotive_intent.services.pii_redactor import get_pii_redactor
-        
-        redactor = get_pii_redactor()
         text = "Mr. Sharma, phone 9876543210, email test@mail.com"
         result = redactor.redact(text)
         
         assert result.redaction_count >= 2
     
-    def test_no_pii_is_safe(self):
+    def test_no_pii_is_safe(self, redactor):
         """Test that text without PII is marked safe."""
-        from automotive_intent.services.pii_redactor import get_pii_redactor
-        
-        redactor = get_pii_redactor()
         assert redactor.is_safe("Brake pads need replacement")
+        assert not redactor.is_safe("Call me at 9876543210 about the brakes")
     
-    def test_vin_masking(self):
-        """Test partial VIN masking."""
-        from automotive_intent.services.pii_redactor import get_pii_redactor
+    @pytest.mark.skipif(not HYPERSCAN_AVAILABLE, reason="hyperscan not installed")
+    def test_scan_backends_agree(self):
+        """Test that the Hyperscan-gated and pure re paths detect and redact identically."""
+        gated = PIIRedactor()
+        plain = PIIRedactor()
+        plain.hs_database = None
+        
+        for text in [
+            "Brake noise when stopping",
+            "Part no. X98765432101 fitted",
+            "Ref_9876543210_end",
+            "Mr. Sharma at +91 9876543210, flat B12, 12 MG Road, 560001",
+            "ग्राहक का नंबर 9876543210 है",
+            "नंबर ९८७६५४३२१० है",
+            "Aadhaar 1234\u00a05678\u00a09012",
+            "Mr.\u00a0Kumar",
+            "Mr. Kumar ABCDE1234F",
+        ]:
+            assert gated.is_safe(text) == plain.is_safe(text), text
+            assert gated.redact(text) == plain.redact(text)
+    
+    def test_redaction_matches_sequential_passes(self, redactor):
+        """Test that redaction equals one findall/sub pass per pattern, in type order."""
+        for text in [
+            "Mr. Kumar ABCDE1234F",
+            "Mr. Sharma at +91 9876543210, flat B12, 12 MG Road, 560001",
+            "Card 4111 1111 1111 1111, Aadhaar 1234 5678 9012",
+            "Dr. Rao, 221B Baker Street, rao@clinic.in",
+        ]:
+            expected, types = text, []
+            for pii_type, patterns in PII_PATTERNS.items():
+                for pattern in patterns:
+                    compiled = re.compile(pattern, re.IGNORECASE)
+                    types += [pii_type] * len(compiled.findall(expected))
+                    expected = compiled.sub(REDACTION_MASKS[pii_type], expected)
+            
+            result = redactor.redact(text)
+            assert result.redacted_text == expected
+            assert [p["type"] for p in result.pii_found] == types
+        
+        assert redactor.redact("Mr. Kumar ABCDE1234F").redacted_text == "[NAME_REDACTED] [PAN_REDACTED]"
+    
+    def test_redact_batch_matches_single(self, redactor):
+        """Test that batch redaction returns the same results, in order."""
+        texts = ["Brake noise", "Call 9876543210", "", "Email a@b.com, phone 9876543210"]
         
-        redactor = get_pii_redactor()
+        assert redactor.redact_batch(texts) == [redactor.redact(t) for t in texts]
+    
+    def test_vin_masking(self, redactor):
+        """Test partial VIN masking."""
         masked = redactor.mask_vin("1HGCM82633A123456")
         
         assert masked.startswith("1HG")
@@ -140,57 +192,76 @@ class TestPIIRedactor:
 class TestVINDecoder:
     """Tests for VIN and registration number decoding."""
     
-    def test_indian_registration(self):
+    def test_indian_registration(self, decoder):
         """Test Indian vehicle registration parsing."""
-        from automotive_intent.services.vin_decoder import get_vin_decoder
-        
-        decoder = get_vin_decoder()
         info = decoder.decode("MH12AB1234")
         
         assert info is not None
         assert info.vin == "MH12AB1234"
     
-    def test_standard_vin(self):
+    def test_standard_vin(self, decoder):
         """Test 17-character VIN parsing."""
-        from automotive_intent.services.vin_decoder import get_vin_decoder
-        
-        decoder = get_vin_decoder()
         info = decoder.decode("1HGCM82633A123456")
         
         assert info is not None
         assert info.make == "Honda"
     
-    def test_invalid_vin(self):
+    def test_invalid_vin(self, decoder):
         """Test that invalid VIN returns None."""
-        from automotive_intent.services.vin_decoder import get_vin_decoder
-        
-        decoder = get_vin_decoder()
         assert decoder.decode("INVALID") is None
         assert decoder.decode("ABC") is None
+        # Right length, but I/O/Q are never used in VINs
+        assert decoder.decode("1HGCM82633I123456") is None
+        assert decoder.decode("1HGCM8263OQ123456") is None
     
-    def test_vehicle_filter_tags(self):
-        """Test that filter tags are generated."""
-        from automotive_intent.services.vin_decoder import get_vin_decoder
+    def test_search_pattern_finds_vin_in_text(self, decoder):
+        """Test that the precompiled search pattern pulls a decodable VIN out of free text."""
+        match = VIN_OR_REG_SEARCH_PATTERN.search("Car 1hgcm82633a123456 pulls left")
         
-        decoder = get_vin_decoder()
+        assert match is not None
+        assert decoder.decode(match.group()).make == "Honda"
+    
+    def test_vehicle_filter_tags(self, decoder):
+        """Test that filter tags are generated."""
         info = decoder.decode("1HGCM82633A123456")
         tags = info.get_filter_tags()
         
         assert isinstance(tags, list)
+        assert info.filter_tags is info.filter_tags
+        assert tags == list(info.filter_tags) == ["make:honda", "gen:legacy"]
+    
+    def test_filter_tags_outside_tables(self):
+        """Test that makes and years outside the precomputed tables still get tags."""
+        info = VehicleInfo(vin="X", make="Skoda", year=2022, fuel_type="CNG")
+        
+        assert info.filter_tags == ("make:skoda", "fuel:cng", "gen:current")
 
 
 # =============================================================================
 # FEEDBACK LOOP TESTS
 # =============================================================================
 
+def _entry(**overrides) -> FeedbackEntry:
+    """A correct brake-noise feedback entry, with any fields overridden."""
+    fields = dict(
+        ticket_id="T-1",
+        was_correct=True,
+        predicted_system="BRAKES",
+        predicted_component="PADS_ROTORS",
+        predicted_failure_mode="SQUEALING",
+        predicted_confidence=0.9,
+        original_complaint="Brake noise",
+    )
+    fields.update(overrides)
+    return FeedbackEntry(**fields)
+
+
 class TestFeedbackLoop:
     """Tests for closed-loop learning feedback system."""
     
-    def test_record_feedback(self, tmp_path):
+    def test_record_feedback(self):
         """Test recording feedback entry."""
-        from automotive_intent.services.feedback_loop import FeedbackStore, FeedbackEntry
-        
-        store = FeedbackStore(storage_path=tmp_path / "feedback.json")
+        store = FeedbackStore(storage_path=io.BytesIO())
         
         entry = FeedbackEntry(
             ticket_id="TEST-001",
@@ -205,11 +276,9 @@ class TestFeedbackLoop:
         success = store.record_feedback(entry)
         assert success
     
-    def test_accuracy_stats(self, tmp_path):
+    def test_accuracy_stats(self):
         """Test accuracy statistics calculation."""
-        from automotive_intent.services.feedback_loop import FeedbackStore, FeedbackEntry
-        
-        store = FeedbackStore(storage_path=tmp_path / "feedback.json")
+        store = FeedbackStore(storage_path=io.BytesIO())
         
         # Add mix of correct and incorrect
         for i in range(3):
@@ -241,6 +310,145 @@ class TestFeedbackLoop:
         assert stats.incorrect_count == 1
         assert stats.accuracy_rate == 0.75
 
+    def test_buffered_writes_flush_together(self, tmp_path):
+        """Test that buffered entries reach disk in one flush and still count in stats."""
+        path = tmp_path / "feedback.json"
+        store = FeedbackStore(storage_path=path, buffer_size=3)
+        entry = _entry(ticket_id="BUF-0")
+
+        store.record_feedback(entry)
+        store.record_feedback(entry.model_copy(update={"ticket_id": "BUF-1"}))
+        assert path.read_bytes() == b""
+        assert store.get_accuracy_stats().total_feedback == 2  # reads flush pending entries
+
+        for i in range(2, 5):
+            store.record_feedback(entry.model_copy(update={"ticket_id": f"BUF-{i}"}))
+        assert len(path.read_text().splitlines()) == 5
+        store.record_feedback(entry.model_copy(update={"ticket_id": "BUF-5"}))
+        store.flush()
+        assert len(path.read_text().splitlines()) == 6
+
+    def test_failed_flush_keeps_whole_batch(self):
+        """Test that a failed flush leaves storage untouched and keeps every buffered entry."""
+        class FailingOnce(io.BytesIO):
+            fail = True
+            def writelines(self, lines):
+                for i, line in enumerate(lines):
+                    if i == 1 and self.fail:
+                        self.fail = False
+                        raise OSError("disk full")
+                    self.write(line)
+        
+        stream = FailingOnce()
+        store = FeedbackStore(storage_path=stream, buffer_size=2)
+        entry = _entry(ticket_id="FAIL-0")
+        
+        assert store.record_feedback(entry)
+        assert store.record_feedback(entry.model_copy(update={"ticket_id": "FAIL-1"}))
+        assert stream.getvalue() == b""
+        
+        store.flush()
+        assert [json.loads(line)["ticket_id"] for line in stream.getvalue().splitlines()] == ["FAIL-0", "FAIL-1"]
+
+    def test_failed_write_through_can_be_retried(self):
+        """Test that a failed unbuffered write reports False and a retry stores the entry once."""
+        class FailingOnce(io.BytesIO):
+            fail = True
+            def writelines(self, lines):
+                if self.fail:
+                    self.fail = False
+                    raise OSError("disk full")
+                super().writelines(lines)
+        
+        stream = FailingOnce()
+        store = FeedbackStore(storage_path=stream)
+        entry = _entry(ticket_id="RETRY-1")
+        
+        assert not store.record_feedback(entry)
+        assert store.record_feedback(entry)
+        store.flush()
+        assert [json.loads(line)["ticket_id"] for line in stream.getvalue().splitlines()] == ["RETRY-1"]
+
+    def test_buffered_entries_flushed_at_exit(self, tmp_path):
+        """Test that the exit hook writes out entries still in the buffer."""
+        path = tmp_path / "feedback.jsonl"
+        store = FeedbackStore(storage_path=path, buffer_size=10)
+        store.record_feedback(_entry(ticket_id="EXIT-1"))
+        assert path.read_bytes() == b""
+        
+        _flush_at_exit(weakref.ref(store))
+        assert json.loads(path.read_text())["ticket_id"] == "EXIT-1"
+
+    def test_legacy_default_store_migrated(self, tmp_path, monkeypatch):
+        """Test that history in the old default data/feedback.json is carried over."""
+        from automotive_intent.services import feedback_loop
+        
+        legacy_path = tmp_path / "feedback.json"
+        monkeypatch.setattr(feedback_loop, "DEFAULT_STORAGE_PATH", tmp_path / "feedback.jsonl")
+        monkeypatch.setattr(feedback_loop, "LEGACY_STORAGE_PATH", legacy_path)
+        legacy = _entry(ticket_id="LEGACY-1", was_correct=False, predicted_confidence=0.7)
+        legacy_path.write_text(json.dumps([legacy.model_dump()], indent=2))
+        
+        stats = FeedbackStore().get_accuracy_stats()
+        
+        assert stats.total_feedback == 1
+        assert stats.incorrect_count == 1
+
+    def test_invalid_legacy_rows_skipped(self, tmp_path):
+        """Test that malformed rows in a legacy JSON array are dropped during conversion."""
+        path = tmp_path / "feedback.json"
+        valid = _entry(ticket_id="LEGACY-OK")
+        broken = valid.model_dump(mode="json") | {"ticket_id": "LEGACY-BAD", "predicted_system": None}
+        path.write_text(json.dumps([valid.model_dump(mode="json"), "not an entry", broken]))
+        
+        store = FeedbackStore(storage_path=path)
+        
+        assert [e["ticket_id"] for e in store._load()] == ["LEGACY-OK"]
+        assert store.get_accuracy_stats().total_feedback == 1
+
+    def test_incremental_stats_match_rescan(self, tmp_path):
+        """Test that running aggregates agree with a fresh scan, including external appends."""
+        path = tmp_path / "feedback.json"
+        store = FeedbackStore(storage_path=path)
+        entry = _entry(
+            was_correct=False,
+            predicted_confidence=0.7,
+            actual_system="BRAKES",
+            actual_failure_mode="GRINDING",
+        )
+        store.record_feedback(entry)
+        assert store.get_accuracy_stats().total_feedback == 1
+
+        store.record_feedback(entry.model_copy(update={"ticket_id": "T-2", "was_correct": True}))
+        # A second writer appending to the same file forces a rescan
+        FeedbackStore(storage_path=path).record_feedback(entry.model_copy(update={"ticket_id": "T-3"}))
+
+        stats = store.get_accuracy_stats()
+        assert stats == FeedbackStore(storage_path=path).get_accuracy_stats()
+        assert stats.total_feedback == 3
+        assert stats.by_system["BRAKES"] == {"correct": 1, "incorrect": 2}
+        assert len(stats.top_misdiagnoses) == 2
+        assert stats.recent_accuracy == pytest.approx(1 / 3)
+
+    def test_legacy_json_array_converted(self, tmp_path):
+        """Test that a legacy JSON array store is converted to JSON Lines and appended to."""
+        path = tmp_path / "feedback.json"
+        legacy = _entry(
+            ticket_id="LEGACY-1",
+            was_correct=False,
+            predicted_confidence=0.7,
+            actual_resolution="Replaced rotor",
+        )
+        path.write_text(json.dumps([legacy.model_dump()], indent=2))
+        
+        store = FeedbackStore(storage_path=path)
+        store.record_feedback(legacy.model_copy(update={"ticket_id": "NEW-1", "was_correct": True}))
+        
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)["ticket_id"] for line in lines] == ["LEGACY-1", "NEW-1"]
+        assert store.get_accuracy_stats().total_feedback == 2
+        assert len(store.get_corrections_for_retraining()) == 1
+
 
 # =============================================================================
 # KNOWLEDGE HIERARCHY TESTS
@@ -251,8 +459,6 @@ class TestKnowledgeHierarchy:
     
     def test_tsb_supersedes_manual(self):
         """Test that TSB documents rank higher than manuals."""
-        from automotive_intent.services.knowledge_hierarchy import get_knowledge_hierarchy
-        
         hierarchy = get_knowledge_hierarchy()
         
         docs = [
@@ -266,8 +472,6 @@ class TestKnowledgeHierarchy:
     
     def test_recall_highest_priority(self):
         """Test that safety recalls have highest priority."""
-        from automotive_intent.services.knowledge_hierarchy import get_knowledge_hierarchy
-        
         hierarchy = get_knowledge_hierarchy()
         
         docs = [
@@ -280,10 +484,30 @@ class TestKnowledgeHierarchy:
         
         assert ranked[0]["metadata"]["source_type"] == "recall"
     
+    def test_source_type_normalization(self):
+        """Test that source types are interned at the boundary and mixed case still ranks."""
+        hierarchy = get_knowledge_hierarchy()
+        raw = "tsb".upper()
+        assert normalize_source_type(raw) is sys.intern("tsb")
+        
+        docs = [
+            {"content": "Manual", "metadata": {"source_type": "Manual"}, "score": 0.9},
+            {"content": "TSB", "metadata": {"source_type": normalize_source_type(raw)}, "score": 0.8},
+        ]
+        ranked = hierarchy.rerank(docs)
+        assert [d["_source_type"] for d in ranked] == ["tsb", "manual"]
+    
+    def test_bulletin_header_metadata(self):
+        """Test that a bulletin's declared source type and date reach its chunk metadata."""
+        tsb = Path(__file__).parent.parent / "data" / "knowledge_base" / "tsb_water_pump.md"
+        header = _document_header(tsb.read_text(encoding="utf-8"))
+        
+        assert normalize_source_type(header["source_type"]) == "tsb"
+        assert header["effective_date"] == "2024-01-15"
+        assert _document_header("# Brake System Diagnostic Guide\n\n## Squealing\n") == {}
+    
     def test_audit_trail(self):
         """Test that audit trail is generated."""
-        from automotive_intent.services.knowledge_hierarchy import get_knowledge_hierarchy
-        
         hierarchy = get_knowledge_hierarchy()
         docs = [{"content": "test", "metadata": {"source_type": "manual"}, "score": 0.5}]
         
@@ -292,6 +516,12 @@ class TestKnowledgeHierarchy:
         
         assert "retrieved_count" in audit
         assert "timestamp" in audit
+    
+    def test_audit_timestamp_format(self):
+        """Test that the cached-prefix timestamp matches datetime.now().isoformat()."""
+        stamp = _iso_now()
+        
+        assert abs(datetime.fromisoformat(stamp) - datetime.now()) < timedelta(seconds=1)
 
 
 # =============================================================================
@@ -301,35 +531,57 @@ class TestKnowledgeHierarchy:
 class TestPartsGraph:
     """Tests for parts dependency graph."""
     
+    def test_graph_loaded_once(self):
+        """Test that the graph is parsed once and shared read-only."""
+        assert load_parts_graph() is load_parts_graph()
+        with pytest.raises(TypeError):
+            load_parts_graph()["water_pump"] = {}
+    
     def test_graph_loads(self):
         """Test that parts graph JSON loads correctly."""
-        graph_path = Path(__file__).parent.parent / "data" / "parts_graph.json"
-        
-        with open(graph_path) as f:
-            graph = json.load(f)
+        graph = load_parts_graph()
         
         assert "water_pump" in graph
         assert "brake_pads_front" in graph
     
     def test_water_pump_dependencies(self):
         """Test water pump has correct mandatory parts."""
-        graph_path = Path(__file__).parent.parent / "data" / "parts_graph.json"
-        
-        with open(graph_path) as f:
-            graph = json.load(f)
-        
-        wp = graph["water_pump"]
+        wp = get_part("water_pump")
         assert "water_pump_gasket" in wp["mandatory"]
         assert "coolant" in wp["mandatory"]
+        assert get_part("flux_capacitor") is None
     
     def test_labor_notes_present(self):
         """Test that labor notes are included."""
-        graph_path = Path(__file__).parent.parent / "data" / "parts_graph.json"
+        assert "labor_note" in get_part("water_pump")
+
+
+
+# =============================================================================
+# REPORTING TESTS
+# =============================================================================
+
+class TestReporting:
+    """Tests for PDF job card generation."""
+    
+    @pytest.mark.parametrize("status", ["CONFIRMED", "SYSTEM_ERROR"])
+    def test_job_card_from_service_ticket(self, status):
+        """Test that a job card renders from a pipeline ServiceTicket, with or without a diagnosis."""
+        pytest.importorskip("reportlab")
+        from automotive_intent.core.schemas import Intent, RequestMeta, ServiceTicket, Triage
+        from automotive_intent.services.reporting import get_report_generator
+        
+        diagnosed = status == "CONFIRMED"
+        ticket = ServiceTicket(
+            classification_status=status,
+            meta=RequestMeta(original_text="Brake noise when stopping", detected_language="en"),
+            intent=Intent(system="BRAKES", component="PADS_ROTORS", failure_mode="SQUEALING", confidence=0.9) if diagnosed else None,
+            triage=Triage(severity="HIGH", vehicle_state="DRIVABLE_WITH_CAUTION", suggested_action="Inspect brake pads") if diagnosed else None,
+        )
         
-        with open(graph_path) as f:
-            graph = json.load(f)
+        pdf = get_report_generator().generate_job_card(ticket)
         
-        assert "labor_note" in graph["water_pump"]
+        assert pdf.startswith(b"%PDF")
 
 
 if __name__ == "__main__":
@@ -3,10 +3,14 @@ GarageIQ — Premium Demo UI
 Enhanced UI/UX with sample inputs, animated results, and polished design.
 """
 import sys
-import json
+import re
+import logging
 import time
+import hashlib
+import threading
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # CRITICAL: Load .env BEFORE importing anything from automotive_intent
 # Otherwise config.py will read empty env vars
@@ -21,13 +25,11 @@ import os
 os.environ.setdefault("GROQ_API_KEY", os.getenv("GROQ_API_KEY", ""))
 
 import streamlit as st
-from automotive_intent.core.schemas import ClassificationRequest
-from automotive_intent.pipeline import create_pipeline
-from automotive_intent.services.entities import get_entity_extractor
-from automotive_intent.services.transcriber import get_transcriber
-from automotive_intent.services.reporting import get_report_generator
+from automotive_intent.core.schemas import ClassificationRequest, RequestMeta, ServiceTicket
 from audio_recorder_streamlit import audio_recorder
 
+logger = logging.getLogger(__name__)
+
 # Page config
 st.set_page_config(
     page_title="GarageIQ",
@@ -39,203 +41,16 @@ st.set_page_config(
 # Initialize session state
 if "history" not in st.session_state:
     st.session_state.history = []
-if "pipeline" not in st.session_state:
-    st.session_state.pipeline = None
+
+
+@st.cache_resource(show_spinner=False)
+def _css() -> str:
+    """Stylesheet markup, read from ui/app.css once per server process."""
+    return f"<style>\n{Path(__file__).with_name('app.css').read_text()}</style>"
+
 
 # Premium CSS with glassmorphism and animations
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
-    html, body, [class*="css"] { font-family: 'Inter', sans-serif; }
-    
-    .stApp { 
-        background: linear-gradient(135deg, #0a0a1a 0%, #1a1a2e 50%, #0f1729 100%); 
-    }
-    
-    /* Header */
-    .main-header {
-        text-align: center;
-        padding: 1.5rem 0;
-        margin-bottom: 1rem;
-    }
-    .main-title {
-        font-size: 2.8rem;
-        font-weight: 800;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin: 0;
-    }
-    .subtitle { 
-        color: #94a3b8; 
-        font-size: 1.1rem; 
-        margin-top: 0.5rem;
-        font-weight: 400;
-    }
-    .subtitle-highlight { color: #a78bfa; font-weight: 600; }
-    
-    /* Cards */
-    .glass-card {
-        background: rgba(255, 255, 255, 0.03);
-        border: 1px solid rgba(255, 255, 255, 0.08);
-        border-radius: 16px;
-        padding: 1.5rem;
-        backdrop-filter: blur(10px);
-        margin-bottom: 1rem;
-    }
-    
-    /* Status badges */
-    .status-confirmed { 
-        background: linear-gradient(135deg, #10B981 0%, #059669 100%); 
-        color: white; padding: 0.5rem 1.2rem; border-radius: 50px; 
-        font-weight: 700; font-size: 0.9rem; display: inline-block;
-        box-shadow: 0 4px 15px rgba(16, 185, 129, 0.4);
-    }
-    .status-ambiguous { 
-        background: linear-gradient(135deg, #F59E0B 0%, #D97706 100%); 
-        color: white; padding: 0.5rem 1.2rem; border-radius: 50px; font-weight: 700;
-        box-shadow: 0 4px 15px rgba(245, 158, 11, 0.4);
-    }
-    .status-out-of-scope { 
-        background: linear-gradient(135deg, #6B7280 0%, #4B5563 100%); 
-        color: white; padding: 0.5rem 1.2rem; border-radius: 50px; font-weight: 700;
-    }
-    
-    /* Intent path */
-    .intent-path { 
-        font-family: 'JetBrains Mono', 'Fira Code', monospace; 
-        background: linear-gradient(135deg, rgba(102, 126, 234, 0.2) 0%, rgba(118, 75, 162, 0.2) 100%);
-        padding: 1rem 1.5rem; 
-        border-radius: 12px; 
-        color: #c4b5fd; 
-        font-size: 1rem; 
-        border-left: 4px solid #8b5cf6;
-        margin: 1rem 0;
-        font-weight: 600;
-        letter-spacing: 0.5px;
-    }
-    
-    /* Metrics */
-    .metric-card {
-        background: rgba(139, 92, 246, 0.1);
-        border: 1px solid rgba(139, 92, 246, 0.2);
-        border-radius: 12px;
-        padding: 1rem;
-        text-align: center;
-    }
-    .metric-value { font-size: 1.8rem; font-weight: 700; color: #a78bfa; }
-    .metric-label { font-size: 0.8rem; color: #94a3b8; text-transform: uppercase; letter-spacing: 1px; }
-    
-    /* Language badge */
-    .lang-badge { 
-        background: linear-gradient(135deg, rgba(99, 102, 241, 0.2) 0%, rgba(139, 92, 246, 0.2) 100%);
-        color: #a5b4fc; 
-        padding: 0.4rem 1rem; 
-        border-radius: 20px; 
-        font-size: 0.8rem; 
-        font-weight: 600;
-        border: 1px solid rgba(139, 92, 246, 0.3);
-        display: inline-block;
-    }
-    
-    /* Sample buttons */
-    .sample-btn {
-        background: rgba(255, 255, 255, 0.05);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-        border-radius: 8px;
-        padding: 0.6rem 0.8rem;
-        color: #94a3b8;
-        cursor: pointer;
-        transition: all 0.2s;
-        font-size: 0.85rem;
-        margin: 0.2rem;
-    }
-    .sample-btn:hover {
-        background: rgba(139, 92, 246, 0.15);
-        border-color: rgba(139, 92, 246, 0.3);
-        color: #c4b5fd;
-    }
-    
-    /* Inputs */
-    .stTextArea textarea { 
-        background: rgba(255, 255, 255, 0.05) !important; 
-        border: 1px solid rgba(255, 255, 255, 0.1) !important; 
-        border-radius: 12px !important; 
-        color: white !important;
-        font-size: 1rem !important;
-    }
-    .stTextArea textarea:focus {
-        border-color: rgba(139, 92, 246, 0.5) !important;
-        box-shadow: 0 0 0 3px rgba(139, 92, 246, 0.1) !important;
-    }
-    
-    /* Buttons */
-    .stButton > button { 
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important; 
-        color: white !important; 
-        border: none !important; 
-        border-radius: 50px !important; 
-        padding: 0.7rem 2rem !important; 
-        font-weight: 700 !important;
-        font-size: 0.95rem !important;
-        letter-spacing: 0.5px;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-        transition: transform 0.2s, box-shadow 0.2s !important;
-    }
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.5) !important;
-    }
-    
-    /* Sidebar */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #0f1729 0%, #1a1a2e 100%);
-        border-right: 1px solid rgba(255, 255, 255, 0.05);
-    }
-    
-    /* Expander */
-    .streamlit-expanderHeader {
-        background: rgba(255, 255, 255, 0.03) !important;
-        border-radius: 8px !important;
-    }
-    
-    /* Info boxes */
-    .info-box {
-        background: rgba(59, 130, 246, 0.1);
-        border: 1px solid rgba(59, 130, 246, 0.2);
-        border-radius: 10px;
-        padding: 0.8rem 1rem;
-        color: #93c5fd;
-        font-size: 0.9rem;
-    }
-    
-    /* Similar tickets */
-    .ticket-item {
-        background: rgba(255, 255, 255, 0.02);
-        border: 1px solid rgba(255, 255, 255, 0.05);
-        border-radius: 8px;
-        padding: 0.6rem 1rem;
-        margin: 0.4rem 0;
-        font-size: 0.85rem;
-    }
-    
-    /* Confidence bar */
-    .confidence-bar {
-        background: rgba(139, 92, 246, 0.2);
-        border-radius: 10px;
-        height: 8px;
-        overflow: hidden;
-        margin: 0.5rem 0;
-    }
-    .confidence-fill {
-        background: linear-gradient(90deg, #10B981 0%, #34D399 100%);
-        height: 100%;
-        border-radius: 10px;
-        transition: width 0.5s ease;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(_css(), unsafe_allow_html=True)
 
 
 # Sample inputs for quick testing
@@ -249,37 +64,225 @@ SAMPLE_INPUTS = [
 ]
 
 
+# Script/keyword checks that settle detection before any model runs
+DEVANAGARI_RE = re.compile(r'[\u0900-\u097F]')
+HINGLISH_RE = re.compile(
+    r'\b(?:gaadi|gadi|nahi|hai|mein|kya|kar|raha|rahi|ho|lagane|awaaz)\b',
+    re.IGNORECASE
+)
+
+
+@st.cache_resource(show_spinner=False)
+def _lid():
+    """
+    fastText language-ID model (lid.176.ftz), or None if fasttext or the
+    model file isn't available - detect_language then uses langdetect.
+    """
+    try:
+        import fasttext
+    except ImportError:
+        return None
+    try:
+        return fasttext.load_model(os.getenv("AMI_LID_MODEL", "lid.176.ftz"))
+    except Exception as e:
+        logger.warning(f"Could not load fastText language ID model, using langdetect: {e}")
+        return None
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
 def detect_language(text: str) -> tuple:
     """Detect language with confidence."""
+    # Devanagari script is unambiguously Hindi here
+    if DEVANAGARI_RE.search(text):
+        return "hi", 0.9
+    
+    # Romanized Hindi (Hinglish) keywords
+    if HINGLISH_RE.search(text):
+        return "hi", 0.7
+    
+    lid = _lid()
+    if lid is not None:
+        try:
+            # fastText rejects newlines; labels look like "__label__hi"
+            labels, probs = lid.predict(text.replace("\n", " "), k=1)
+            if labels:
+                return labels[0].replace("__label__", ""), float(probs[0])
+        except Exception as e:
+            logger.warning(f"fastText language ID failed, using langdetect: {e}")
+    
     try:
-        from langdetect import detect, detect_langs
+        from langdetect import detect_langs
         probs = detect_langs(text)
         if probs:
             top = probs[0]
             return top.lang, top.prob
-    except:
-        pass
+    except Exception:
+        pass  # e.g. no detectable features in the text
     
-    # Fallback: check for Hindi characters
-    hindi_chars = set("अआइईउऊएऐओऔकखगघचछजझटठडढणतथदधनपफबभमयरलवशषसह")
-    if any(c in hindi_chars for c in text):
-        return "hi", 0.9
+    # Last resort
+    return "en", 0.8
+
+
+# Heavy singletons, shared across reruns and sessions. Their modules are
+# imported on first use so the first paint doesn't wait on them.
+@st.cache_resource(show_spinner=False)
+def get_pipeline():
+    """
+    Classification pipeline (built once per server process).
+    Errors aren't cached, so a failed build is retried on the next classification.
+    """
+    from automotive_intent.pipeline import create_pipeline
+    return create_pipeline(use_ollama=True, use_nllb=False)
+
+
+@st.cache_resource(show_spinner=False)
+def _extractor():
+    from automotive_intent.services.entities import get_entity_extractor
+    return get_entity_extractor()
+
+
+@st.cache_resource(show_spinner=False)
+def _transcriber():
+    from automotive_intent.services.transcriber import get_transcriber
+    return get_transcriber()
+
+
+@st.cache_resource(show_spinner=False)
+def _reporter():
+    from automotive_intent.services.reporting import get_report_generator
+    return get_report_generator()
+
+
+# Pure per-text results, so identical inputs (e.g. sample taps) skip the work
+@st.cache_data(ttl=600, max_entries=512, show_spinner=False)
+def extract_entities(text: str) -> dict:
+    return _extractor().extract_all(text)
+
+
+# Statuses from a failed LLM call or unusable output, which may succeed on retry
+UNCACHED_STATUSES = {"SYSTEM_ERROR", "VALIDATION_FAILED"}
+
+
+class _UncachedTicket(Exception):
+    """Carries a ticket out of a cached function without caching it."""
+    def __init__(self, ticket):
+        super().__init__(ticket.classification_status)
+        self.ticket = ticket
+
+
+def _restamp(ticket):
+    """Copy of a shared ticket with a fresh ticket_id and timestamp for this request."""
+    return ticket.model_copy(update={
+        "ticket_id": ServiceTicket.model_fields["ticket_id"].get_default(call_default_factory=True),
+        "meta": ticket.meta.model_copy(update={
+            "timestamp_utc": RequestMeta.model_fields["timestamp_utc"].get_default(call_default_factory=True),
+        }),
+    })
+
+
+@st.cache_data(ttl=600, max_entries=512, show_spinner=False)
+def _classify_cached(text: str):
+    ticket = get_pipeline().process(ClassificationRequest(text=text))
+    if ticket.classification_status in UNCACHED_STATUSES:
+        raise _UncachedTicket(ticket)  # exceptions aren't cached
+    return ticket
+
+
+def classify_complaint(text: str):
+    try:
+        return _restamp(_classify_cached(text))
+    except _UncachedTicket as e:
+        return e.ticket
+
+
+def _audio_digest(audio_bytes: bytes) -> bytes:
+    return hashlib.blake2b(audio_bytes, digest_size=16).digest()
+
+
+# Keyed by a digest of the clip rather than the raw bytes
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False, hash_funcs={bytes: _audio_digest})
+def transcribe_audio(audio_bytes: bytes) -> str:
+    return _transcriber().transcribe(audio_bytes)
+
+
+@st.cache_resource(show_spinner=False)
+def _sample_tickets() -> dict:
+    """
+    Fast-mode tickets for SAMPLE_INPUTS, keyed by text.
     
-    # Check for Hinglish patterns
-    hinglish_words = ["gaadi", "gadi", "nahi", "hai", "mein", "kya", "kar", "raha", "rahi", "ho", "lagane", "awaaz"]
-    if any(w in text.lower() for w in hinglish_words):
-        return "hi", 0.7
+    Filled in by a background thread once per server process, with the
+    samples classified in parallel. Samples that aren't ready (or failed)
+    fall back to the live pipeline. Tickets are shared, so callers restamp
+    them before use.
+    """
+    tickets = {}
     
-    return "en", 0.8
+    def prewarm():
+        try:
+            from automotive_intent.pipeline import create_pipeline
+            pipeline = create_pipeline(use_ollama=True, use_nllb=False)
+        except Exception:
+            return  # the live path reports errors
+        
+        def classify(text):
+            try:
+                ticket = pipeline.process(ClassificationRequest(text=text))
+            except Exception:
+                return  # the live path reports errors
+            # A failed LLM call comes back as a ticket; leave it to the live path
+            if ticket.classification_status not in UNCACHED_STATUSES:
+                tickets[text] = ticket
+        
+        with ThreadPoolExecutor(max_workers=len(SAMPLE_INPUTS)) as pool:
+            pool.map(classify, [sample["text"] for sample in SAMPLE_INPUTS])
+    
+    threading.Thread(target=prewarm, name="sample-prewarm", daemon=True).start()
+    return tickets
 
 
-def init_pipeline():
-    """Initialize pipeline once."""
-    if st.session_state.pipeline is None:
+@st.cache_resource(show_spinner=False)
+def _prewarm_agents() -> threading.Thread:
+    """
+    Build the agent orchestrator and load the embedding model in the
+    background, once per server process and only after someone picks
+    advanced mode, so the first advanced request doesn't pay for client
+    setup and model load (and fast-only users never load them).
+    """
+    def prewarm():
         try:
-            st.session_state.pipeline = create_pipeline(use_ollama=True, use_nllb=False)
-        except Exception as e:
-            st.error(f"Pipeline error: {e}")
+            from automotive_intent.agents.orchestrator import get_orchestrator
+            from automotive_intent.services.embeddings import get_embedding_service
+            get_orchestrator()
+            get_embedding_service()
+        except Exception:
+            pass  # the live path reports errors
+    
+    thread = threading.Thread(target=prewarm, name="agent-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+# Shown as each agent in the workflow finishes
+AGENT_STEP_LABELS = {
+    "symptom_analyst": "🔍 Symptoms analysed",
+    "context_retrieval": "📋 Similar cases and 📚 knowledge base searched",
+    "knowledge_retrieval": "📚 Knowledge base searched again",
+    "diagnosis": "🔧 Diagnosis drafted",
+    "refine_query": "🔄 Low confidence, refining the search",
+    "respond": "✅ Response ready",
+}
+
+
+def _agent_steps(text: str, out: dict):
+    """Yield a line per finished agent step; the final response is stored in out["response"]."""
+    from automotive_intent.agents.orchestrator import get_orchestrator
+    from automotive_intent.agents.state import ChatRequest
+    
+    for node, response in get_orchestrator().stream_message(ChatRequest(message=text)):
+        if response is not None:
+            out["response"] = response
+        else:
+            yield f"{AGENT_STEP_LABELS.get(node, node)}  \n"
 
 
 def add_to_history(text: str, result: dict, response_time: float, language: str):
@@ -297,8 +300,18 @@ def add_to_history(text: str, result: dict, response_time: float, language: str)
     st.session_state.history = st.session_state.history[:15]
 
 
+# Button callbacks run before the next script pass, so no st.rerun() is needed
+def _use_sample(text: str):
+    st.session_state.sample_input = text
+    st.session_state.transcribed_input = ""  # Clear transcription
+
+
+def _clear_history():
+    st.session_state.history = []
+
+
 def main():
-    init_pipeline()
+    sample_tickets = _sample_tickets()
     
     # Sidebar
     with st.sidebar:
@@ -312,6 +325,9 @@ def main():
             help="**Fast:** Single LLM call, ~3-5s\n\n**Multi-Agent:** 4 agents with RAG, ~10-15s"
         )
         st.session_state["mode"] = "fast" if "Fast" in mode else "advanced"
+        if st.session_state["mode"] == "advanced":
+            # Start loading the agents while the complaint is being typed
+            _prewarm_agents()
         
         st.markdown("---")
         
@@ -326,17 +342,26 @@ def main():
                 confirmed = sum(1 for h in st.session_state.history if h["status"] == "CONFIRMED")
                 st.metric("Confirmed", confirmed)
         
-        if st.button("🗑️ Clear History", use_container_width=True):
-            st.session_state.history = []
-            st.rerun()
+        st.button("🗑️ Clear History", use_container_width=True, on_click=_clear_history)
         
         st.markdown("")
         
-        for entry in st.session_state.history[:6]:
-            status_emoji = {"CONFIRMED": "●", "AMBIGUOUS": "○", "OUT_OF_SCOPE": "—"}.get(entry["status"], "?")
-            mode_icon = "⚡" if entry.get("mode") == "fast" else "🧠"
-            with st.expander(f"{status_emoji} {entry['text'][:30]}...", expanded=False):
-                st.caption(f"{mode_icon} {entry['response_time_ms']}ms • 🌐 {entry['language'].upper()}")
+        # One table instead of an expander per entry
+        if st.session_state.history:
+            st.dataframe(
+                [
+                    {
+                        "": {"CONFIRMED": "●", "AMBIGUOUS": "○", "OUT_OF_SCOPE": "—"}.get(entry["status"], "?"),
+                        "Complaint": entry["text"],
+                        "Mode": "⚡" if entry.get("mode") == "fast" else "🧠",
+                        "ms": entry["response_time_ms"],
+                        "Lang": entry["language"].upper(),
+                    }
+                    for entry in st.session_state.history[:6]
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
         
         st.markdown("---")
         st.markdown("##### Enterprise Edition 🚀")
@@ -381,16 +406,16 @@ def main():
             )
         
         # Transcribe if audio recorded
-        if audio_bytes and audio_bytes != st.session_state.get("last_audio"):
-            st.session_state.last_audio = audio_bytes  # Prevent re-processing same audio
+        audio_digest = _audio_digest(audio_bytes) if audio_bytes else None
+        if audio_digest and audio_digest != st.session_state.get("last_audio_hash"):
+            st.session_state.last_audio_hash = audio_digest  # Prevent re-processing same audio
             try:
-                transcriber = get_transcriber()
                 with st.spinner("Transcribing..."):
-                    transcribed_text = transcriber.transcribe(audio_bytes)
+                    transcribed_text = transcribe_audio(audio_bytes)
                     if transcribed_text:
+                        # Set before the text area below renders, so no extra rerun is needed
                         st.session_state.transcribed_input = transcribed_text
                         st.session_state.sample_input = ""  # Clear any sample
-                        st.rerun()  # Rerun to populate text area
                     else:
                         st.warning("⚠️ Could not transcribe audio. Check your GROQ_API_KEY.")
             except Exception as e:
@@ -432,10 +457,13 @@ def main():
         sample_cols = st.columns(3)
         for i, sample in enumerate(SAMPLE_INPUTS):
             with sample_cols[i % 3]:
-                if st.button(sample["label"], key=f"sample_{i}", use_container_width=True):
-                    st.session_state.sample_input = sample["text"]
-                    st.session_state.transcribed_input = ""  # Clear transcription
-                    st.rerun()
+                st.button(
+                    sample["label"],
+                    key=f"sample_{i}",
+                    use_container_width=True,
+                    on_click=_use_sample,
+                    args=(sample["text"],),
+                )
         
         # Clear sample input after it's been used (to avoid persistence)
         if st.session_state.sample_input and input_text == st.session_state.sample_input:
@@ -447,14 +475,10 @@ def main():
         st.markdown("### Analysis Result")
         
         if classify_btn and input_text.strip():
-            if st.session_state.pipeline is None:
-                st.error("Pipeline not ready. Please wait...")
-                return
-            
             lang, lang_conf = detect_language(input_text)
             use_advanced = st.session_state.get("mode") == "advanced"
             
-            # Fun loading messages to make wait feel shorter
+            # Loading messages to make the wait feel shorter
             loading_tips = [
                 "Tip: Regular oil changes extend engine life by 30%",
                 "Tip: Check tire pressure monthly for better mileage",
@@ -466,87 +490,46 @@ def main():
                 "Finalizing diagnosis...",
             ]
             
-            # Engaging progress display
+            # One status container for progress, tip and steps
             start_time = time.time()
-            progress_placeholder = st.empty()
-            tip_placeholder = st.empty()
-            status_placeholder = st.empty()
             
             import random
-            current_tip = random.choice(loading_tips)
-            last_tip_change = time.time()
-            
-            def update_progress(step, message, progress_pct):
-                nonlocal current_tip, last_tip_change
-                
-                elapsed = time.time() - start_time
-                
-                # Change tip every 8 seconds
-                if elapsed - last_tip_change > 8:
-                    current_tip = random.choice(loading_tips)
-                    last_tip_change = elapsed
-                
-                with progress_placeholder:
-                    st.progress(progress_pct, text=f"Step {step}: {message}")
-                with tip_placeholder:
-                    st.info(current_tip)
-                with status_placeholder:
-                    # Show encouraging message based on time
-                    if elapsed < 10:
-                        msg = f"⏱️ {elapsed:.0f}s • Analyzing your complaint..."
-                    elif elapsed < 30:
-                        msg = f"⏱️ {elapsed:.0f}s • AI is thinking deeply..."
-                    elif elapsed < 60:
-                        msg = f"⏱️ {elapsed:.0f}s • Almost there, finalizing..."
-                    else:
-                        msg = f"⏱️ {elapsed:.0f}s • Complex case detected..."
-                    st.caption(msg)
             
             try:
-                if use_advanced:
-                    update_progress(1, "Detecting language...", 0.1)
-                    time.sleep(0.15)
-                    
-                    update_progress(2, "📋 Extracting entities...", 0.2)
-                    extractor = get_entity_extractor()
-                    entities = extractor.extract_all(input_text)
+                with st.status("Analyzing your complaint...", expanded=True) as status:
+                    status.write(random.choice(loading_tips))
                     
-                    update_progress(3, "📚 Searching knowledge base...", 0.4)
-                    from automotive_intent.agents.orchestrator import get_orchestrator
-                    from automotive_intent.agents.state import ChatRequest
-                    
-                    update_progress(4, "🧠 Multi-agent reasoning...", 0.6)
-                    orchestrator = get_orchestrator()
-                    response = orchestrator.process_message(ChatRequest(message=input_text.strip()))
-                    
-                    update_progress(5, "Generating diagnosis...", 0.95)
-                    
-                    result_dict = {
-                        "classification_status": "CONFIRMED" if response.confidence >= 0.7 else "AMBIGUOUS",
-                        "intent": response.diagnosis.model_dump() if response.diagnosis else None,
-                        "similar_tickets": [t.model_dump() for t in response.similar_tickets],
-                        "agent_message": response.message
-                    }
-                    ticket = None
-                else:
-                    update_progress(1, "Analyzing input...", 0.2)
-                    time.sleep(0.1)
-                    
-                    update_progress(2, "🧠 LLM classification...", 0.5)
-                    request = ClassificationRequest(text=input_text.strip())
-                    ticket = st.session_state.pipeline.process(request)
-                    result_dict = json.loads(ticket.model_dump_json())
+                    if use_advanced:
+                        status.update(label="🧠 Multi-agent reasoning...")
+                        # Entity extraction overlaps with the streamed agent workflow
+                        with ThreadPoolExecutor(max_workers=1) as pool:
+                            entities_future = pool.submit(_extractor().extract_all, input_text.strip())
+                            agent_result = {}
+                            st.write_stream(_agent_steps(input_text.strip(), agent_result))
+                            response = agent_result["response"]
+                            entities = entities_future.result()
+                        
+                        result_dict = {
+                            "classification_status": "CONFIRMED" if response.confidence >= 0.7 else "AMBIGUOUS",
+                            "intent": response.diagnosis.model_dump() if response.diagnosis else None,
+                            "similar_tickets": [t.model_dump() for t in response.similar_tickets],
+                            "agent_message": response.message
+                        }
+                        ticket = None
+                    else:
+                        status.update(label="🧠 LLM classification...")
+                        sample_ticket = sample_tickets.get(input_text.strip())
+                        ticket = _restamp(sample_ticket) if sample_ticket else classify_complaint(input_text.strip())
+                        result_dict = ticket.model_dump()
+                        entities = extract_entities(input_text.strip())
                     
-                    update_progress(3, "Complete", 1.0)
-                
-                progress_placeholder.empty()
-                tip_placeholder.empty()
-                status_placeholder.empty()
+                    status.update(
+                        label=f"Analysis complete • {time.time() - start_time:.1f}s",
+                        state="complete",
+                        expanded=False
+                    )
                 
             except Exception as e:
-                progress_placeholder.empty()
-                tip_placeholder.empty()
-                status_placeholder.empty()
                 st.error(f"Error: {e}")
                 return
             
@@ -574,11 +557,11 @@ def main():
                 # PDF Download Button
                 if ticket: # Only available in fast mode for now or if we reconstruct ticket
                     try:
-                        pdf_bytes = get_report_generator().generate_job_card(ticket)
+                        pdf_bytes = _reporter().generate_job_card(ticket)
                         st.download_button(
                             label="Download Job Card",
                             data=pdf_bytes,
-                            file_name=f"job_card_{ticket.request_id[:8]}.pdf",
+                            file_name=f"job_card_{ticket.ticket_id}.pdf",
                             mime="application/pdf",
                             use_container_width=True
                         )
@@ -622,9 +605,7 @@ def main():
                     severity_color = {"CRITICAL": "#ef4444", "HIGH": "#f59e0b", "MEDIUM": "#eab308", "LOW": "#22c55e"}.get(ticket.triage.severity, "#94a3b8")
                     st.markdown(f'<div class="info-box"><strong style="color: {severity_color}">{ticket.triage.severity}</strong> • {ticket.triage.suggested_action}</div>', unsafe_allow_html=True)
             
-            # Entity extraction
-            extractor = get_entity_extractor()
-            entities = extractor.extract_all(input_text)
+            # Entities (extracted once per classification, in either mode)
             if entities["vehicle"].make or entities["dtc_codes"]:
                 st.markdown("---")
                 st.markdown("**🔎 Extracted Entities**")